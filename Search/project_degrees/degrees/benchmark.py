@@ -0,0 +1,105 @@
+"""
+Times the degrees searches against each other on random pairs of people.
+
+Usage: python benchmark.py [directory] [pairs] [stats] [compact]
+
+Each search is timed, then run once more with instrumentation to count
+the nodes it expands. If a stats file is named, the JSON record of every
+instrumented run is written to it, one per line. Passing compact loads
+the compact graph instead of the dictionaries.
+"""
+import json
+import random
+import sys
+import time
+
+import degrees
+
+
+def search(function, source, target):
+    """
+    Runs a single search, treating a "no solution" exception as no path.
+    Returns the path and the number of seconds the search took. Cached
+    search trees are dropped first, so every search starts cold.
+    """
+    degrees.trees.clear()
+    degrees.recent_sources.clear()
+    start = time.perf_counter()
+    try:
+        path = function(source, target)
+    except Exception:
+        path = None
+    return path, time.perf_counter() - start
+
+
+def count_nodes(function, source, target, out=None):
+    """
+    Runs a single search with instrumentation on, returning the number
+    of nodes it expanded. The stats record is also written to out.
+    """
+    records = []
+
+    def hook(record):
+        records.append(record)
+        if out is not None:
+            out.write(json.dumps(record) + "\n")
+
+    degrees.stats_hook = hook
+    try:
+        search(function, source, target)
+    finally:
+        degrees.stats_hook = None
+    return records[-1]["nodes_expanded"]
+
+
+def random_pairs(count, seed=50):
+    """
+    Returns count (source, target) pairs of people who starred in a movie.
+    """
+    generator = random.Random(seed)
+    candidates = sorted(person_id for person_id in degrees.people
+                        if degrees.movies_for_person(person_id))
+    return [(generator.choice(candidates), generator.choice(candidates))
+            for _ in range(count)]
+
+
+def main():
+    if len(sys.argv) > 5 or (len(sys.argv) == 5 and sys.argv[4] != "compact"):
+        sys.exit("Usage: python benchmark.py [directory] [pairs] [stats] [compact]")
+    directory = sys.argv[1] if len(sys.argv) > 1 else "large"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    stats_file = open(sys.argv[3], "w", encoding="utf-8") if len(sys.argv) > 3 and sys.argv[3] else None
+
+    print("Loading data...")
+    degrees.load_data(directory, compact=len(sys.argv) > 4)
+    degrees.build_landmarks()
+    print("Data loaded.")
+
+    searches = {
+        "bfs": degrees.shortest_path,
+        "bidirectional": degrees.shortest_path_bidirectional,
+        "bipartite": degrees.shortest_path_bipartite,
+        "astar": degrees.shortest_path_astar,
+    }
+    totals = {name: 0.0 for name in searches}
+    nodes = {name: 0 for name in searches}
+    for source, target in random_pairs(count):
+        lengths = {}
+        for name, function in searches.items():
+            path, seconds = search(function, source, target)
+            totals[name] += seconds
+            nodes[name] += count_nodes(function, source, target, stats_file)
+            lengths[name] = None if path is None else len(path)
+        if len(set(lengths.values())) != 1:
+            print(f"Mismatch for {source} -> {target}: {lengths}")
+        print(f"{source} -> {target}: {lengths['bfs']} degrees")
+
+    for name, seconds in totals.items():
+        print(f"{name}: {seconds:.3f}s total, {seconds / count * 1000:.1f}ms per query, "
+              f"{nodes[name]} nodes expanded")
+    if stats_file is not None:
+        stats_file.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,100 @@
 import csv
+import functools
+import heapq
+import itertools
+import json
+import multiprocessing
 import sys
+from array import array
+from collections import OrderedDict, deque
 
-from util import Node, QueueFrontier
+from graph import Graph, label_components
+from landmarks import LandmarkIndex
+from lookup import NameIndex, name_order
+from snapshot import read_snapshot, write_snapshot
+from streaming import load_streaming
+from util import (ExploredSet, Node, QueueFrontier, SearchStats, SearchTree,
+                  best_first_search, node_path, timed_path)
 
 # Maps names to a set of corresponding person_ids
 names = {}
 
+# Sorted index of names, for prefix and approximate name searches
+name_index = None
+
 # Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
 people = {}
 
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Compact adjacency used instead of the movies/stars sets when
+# the data is loaded with compact=True
+graph = None
+
+# Maps person_ids to a label shared by everyone they are connected to,
+# when the data is not loaded compact (the graph keeps its own labels)
+components = {}
+
+# Landmark distances bounding the separation of any pair, once built
+# by build_landmarks
+landmarks = None
+LANDMARK_COUNT = 8
+
+# Called with the record of every instrumented search, when set
+stats_hook = None
+
+# Most recently used search trees, keyed by their source person_id
+trees = OrderedDict()
+TREE_CACHE_SIZE = 8
+
+# Sources shortest_path searched from recently without a cached tree.
+# A source that comes back gets its tree built and cached
+recent_sources = OrderedDict()
+RECENT_SOURCES = 64
 
-def load_data(directory):
+
+def load_data(directory, compact=False, snapshot=False, streaming=False):
     """
     Load data from CSV files into memory.
+
+    With compact=True, the people and movies dictionaries only keep
+    display details, and who starred in what is stored in graph.
+
+    With snapshot=True, the data is memory-mapped from the directory's
+    snapshot file instead, and the snapshot is (re)written from the CSV
+    files whenever it is missing or out of date. Snapshot loads are
+    always compact, and leave people, names and movies as read-only
+    mappings.
+
+    With streaming=True, the CSV files are read a line at a time into a
+    compact graph, and births, titles and years are not kept in memory
+    at all: people and movies read them back from the CSV files on demand.
     """
+    global graph, people, names, movies, components, name_index, landmarks
+    trees.clear()
+    recent_sources.clear()
+    landmarks = None
+
+    if snapshot:
+        loaded = read_snapshot(directory)
+        if loaded is not None:
+            graph, people, names, movies = loaded
+            components = {}
+            name_index = names
+            return
+        compact = True
+
+    if streaming:
+        graph, people, names, movies = load_streaming(directory)
+        components = {}
+        name_index = names
+        return
+
+    # A previous snapshot load leaves read-only mappings behind
+    if not isinstance(people, dict):
+        people, names, movies = {}, {}, {}
+
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -24,13 +102,18 @@ def load_data(directory):
             people[row["id"]] = {
                 "name": row["name"],
                 "birth": row["birth"],
-                "movies": set()
             }
+            if not compact:
+                people[row["id"]]["movies"] = set()
             if row["name"].lower() not in names:
                 names[row["name"].lower()] = {row["id"]}
             else:
                 names[row["name"].lower()].add(row["id"])
 
+    person_ids = list(people)
+    person_names = [people[person_id]["name"] for person_id in person_ids]
+    name_index = NameIndex(person_ids, person_names, name_order(person_names))
+
     # Load movies
     with open(f"{directory}/movies.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -38,8 +121,20 @@ def load_data(directory):
             movies[row["id"]] = {
                 "title": row["title"],
                 "year": row["year"],
-                "stars": set()
             }
+            if not compact:
+                movies[row["id"]]["stars"] = set()
+
+    if compact:
+        components = {}
+        graph = load_graph(directory)
+        if snapshot:
+            try:
+                write_snapshot(directory, graph, people, movies)
+            except OSError:
+                pass
+        return
+    graph = None
 
     # Load stars
     with open(f"{directory}/stars.csv", encoding="utf-8") as f:
@@ -51,15 +146,62 @@ def load_data(directory):
             except KeyError:
                 pass
 
+    # Label connected components, so unconnected pairs need no search
+    person_ids = list(people)
+    person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+    labels = label_components(len(person_ids), (
+        [person_index[person_id] for person_id in movie["stars"]]
+        for movie in movies.values()
+    ))
+    components = dict(zip(person_ids, labels))
+
+
+def load_graph(directory):
+    """
+    Load stars.csv into a compact Graph over the loaded people and movies.
+    """
+    person_ids = list(people)
+    movie_ids = list(movies)
+    person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+    movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+    credit_people = array("i")
+    credit_movies = array("i")
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                person = person_index[row["person_id"]]
+                movie = movie_index[row["movie_id"]]
+            except KeyError:
+                continue
+            credit_people.append(person)
+            credit_movies.append(movie)
+    return Graph.from_credits(person_ids, movie_ids, credit_people, credit_movies,
+                              person_index=person_index, movie_index=movie_index)
+
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    args = sys.argv[1:]
+    batch = "--batch" in args
+    if batch:
+        pairs_file = args[args.index("--batch") + 1:]
+        args = args[:args.index("--batch")]
+    if len(args) > 1 or (batch and len(pairs_file) > 1):
+        sys.exit("Usage: python degrees.py [directory] [--batch [pairs]]")
+    directory = args[0] if len(args) == 1 else "large"
+
+    if batch:
+        load_data(directory, snapshot=True)
+        if pairs_file:
+            with open(pairs_file[0], encoding="utf-8") as f:
+                run_batch(directory, f, sys.stdout)
+        else:
+            run_batch(directory, sys.stdin, sys.stdout)
+        return
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    load_data(directory, snapshot=True)
     print("Data loaded.")
 
     source = person_id_for_name(input("Name: "))
@@ -69,7 +211,10 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    try:
+        path = shortest_path(source, target)
+    except Exception:
+        path = None
 
     if path is None:
         print("Not connected.")
@@ -84,42 +229,143 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def run_batch(directory, lines, out, processes=None):
+    """
+    Answers one separation query per line of lines, writing a JSON
+    object per query to out in the same order as the input.
+
+    Each line holds a source and a target, separated by a comma, given
+    either as person_ids or as unambiguous names. The data already loaded
+    from directory is shared with the worker processes by forking, so it is
+    only loaded once; where fork is missing, each worker reloads it from
+    the snapshot.
+    """
+    queries = (parse_pair(row) for row in csv.reader(lines) if row)
+    if "fork" in multiprocessing.get_all_start_methods():
+        pool = multiprocessing.get_context("fork").Pool(processes)
+    else:
+        pool = multiprocessing.Pool(processes, initializer=load_data,
+                                    initargs=(directory, False, True))
+    with pool:
+        for record in pool.imap(solve_pair, queries, chunksize=16):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+
+
+def parse_pair(row):
+    """
+    Resolves a (source, target) row to person_ids where possible.
+    """
+    pair = []
+    for field in row[:2]:
+        field = field.strip()
+        if field not in people:
+            person_ids = names.get(field.lower(), set())
+            if len(person_ids) == 1:
+                field = next(iter(person_ids))
+        pair.append(field)
+    return tuple(pair)
+
+
+def solve_pair(pair):
+    """
+    Returns the batch record for a single (source, target) query.
+    """
+    if len(pair) != 2:
+        return {"query": list(pair), "error": "expected a source and a target"}
+    source, target = pair
+    record = {"source": source, "target": target}
+    for person_id in pair:
+        if person_id not in people:
+            record["error"] = f"person not found: {person_id}"
+            return record
+    try:
+        path = shortest_path(source, target)
+    except Exception:
+        path = None
+    record["degrees"] = None if path is None else len(path)
+    record["path"] = path
+    return record
+
+
+def instrumented(search):
+    """
+    Decorates a search function taking (source, target, ..., stats=None).
+    While stats_hook is set, each call gets a fresh SearchStats and the
+    hook receives its record once the search finishes.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(source, target, *args, **kwargs):
+            if stats_hook is None:
+                return function(source, target, *args, **kwargs)
+            stats = SearchStats(search, source=source, target=target)
+            path = None
+            try:
+                path = function(source, target, *args, stats=stats, **kwargs)
+                return path
+            finally:
+                stats.path_length = None if path is None else len(path)
+                stats_hook(stats.record())
+        return wrapper
+    return decorator
+
+
+def json_stats_hook(out):
+    """
+    Returns a stats_hook that writes each record to out as a JSON line.
+    """
+    def hook(record):
+        out.write(json.dumps(record) + "\n")
+    return hook
+
+
+@instrumented("bfs")
+def shortest_path(source, target, stats=None):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
+    The second time a source is searched from, its whole search tree is
+    built and cached, so later searches from it (or to it) are answered
+    in time proportional to the path length.
+
     If no possible path, returns None.
     """
+    if not connected(source, target):
+        raise Exception("no solution")
 
-    path = []
-    explored = []
+    path = cached_path(source, target)
+    if path is not None:
+        return path
+    if repeated_source(source):
+        search_tree(source)
+        return cached_path(source, target)
+
+    if graph is not None:
+        path = graph.shortest_path(source, target, stats)
+        if path is None:
+            raise Exception("no solution")
+        return path
+
+    neighbors = iter_neighbors if stats is None else stats.timed(iter_neighbors)
+    explored = ExploredSet()
+    seen_movies = set()
     start = Node(state=source, parent=None, action=None)
-    frontier = QueueFrontier()
+    frontier = QueueFrontier(stats)
     frontier.add(start)
     while True:
         if frontier.empty():
             raise Exception("no solution")
         node = frontier.remove()
         if node.state == target:
-            while node.parent is not None:
-                movie = node.action
-                person = node.state
-                node = node.parent
-                path.append((movie, person))
-            path.reverse()
-            return path
-        for action, state in neighbors_for_person(node.state):
+            return timed_path(stats, node_path, node)
+        explored.add(node.state)
+        for action, state in neighbors(node.state, seen_movies):
             if not frontier.contains_state(state) and state not in explored:
                 child = Node(state=state, parent=node, action=action)
                 if child.state == target:
-                    while child.parent is not None:
-                        movie = child.action
-                        person = child.state
-                        child = child.parent
-                        path.append((movie, person))
-                    path.reverse()
-                    return path
+                    return timed_path(stats, node_path, child)
                 frontier.add(child)
 
 
@@ -128,6 +374,382 @@ def shortest_path(source, target):
     raise NotImplementedError
 
 
+def connected(source, target):
+    """
+    Returns True if there is any path between source and target,
+    using the component labels built by load_data.
+    """
+    if graph is not None:
+        return graph.connected(source, target)
+    return components[source] == components[target]
+
+
+def repeated_source(source):
+    """
+    Returns True if shortest_path has searched from source recently,
+    remembering source for next time otherwise.
+    """
+    if source in recent_sources:
+        del recent_sources[source]
+        return True
+    recent_sources[source] = True
+    if len(recent_sources) > RECENT_SOURCES:
+        recent_sources.popitem(last=False)
+    return False
+
+
+def search_tree(source):
+    """
+    Returns the breadth-first search tree of everyone connected to
+    source, giving their distance from source and a shortest path to
+    them. The last TREE_CACHE_SIZE trees are kept for reuse.
+    """
+    if source in trees:
+        trees.move_to_end(source)
+        return trees[source]
+
+    tree = grow_tree(source)
+    trees[source] = tree
+    if len(trees) > TREE_CACHE_SIZE:
+        trees.popitem(last=False)
+    return tree
+
+
+def grow_tree(source):
+    """
+    Runs a breadth-first search from source over everyone connected to
+    them, returning the search tree without caching it.
+    """
+    if graph is not None:
+        return graph.search_tree(source)
+
+    tree = SearchTree(source)
+    seen_movies = set()
+    queue = deque([source])
+    while queue:
+        person_id = queue.popleft()
+        for movie_id, neighbor_id in iter_neighbors(person_id, seen_movies):
+            if neighbor_id not in tree:
+                tree.add(neighbor_id, movie_id, person_id)
+                queue.append(neighbor_id)
+    return tree
+
+
+def build_landmarks(count=LANDMARK_COUNT, landmark_ids=None):
+    """
+    Builds the landmark index used by separation_bounds and by
+    shortest_path_astar, from the given landmark person_ids or else
+    from the count people who starred in the most movies.
+    """
+    global landmarks
+    if graph is not None:
+        offsets = graph.person_offsets
+        if landmark_ids is None:
+            landmark_ids = [graph.person_ids[person] for person in heapq.nlargest(
+                count, range(len(graph.person_ids)), key=lambda person: offsets[person + 1] - offsets[person])]
+        person_index = graph.person_index
+    else:
+        if landmark_ids is None:
+            landmark_ids = heapq.nlargest(count, people, key=lambda person_id: len(movies_for_person(person_id)))
+        person_index = {person_id: i for i, person_id in enumerate(people)}
+    landmarks = LandmarkIndex.build(person_index, landmark_ids, grow_tree)
+    return landmarks
+
+
+def separation_bounds(source, target):
+    """
+    Returns (lower, upper) bounds on the degrees of separation between
+    source and target from the landmark index, without searching.
+    upper is None when no landmark reaches them.
+
+    Returns None if the two are not connected.
+    """
+    if not connected(source, target):
+        return None
+    if source == target:
+        return 0, 0
+    return landmarks.bounds(source, target)
+
+
+def cached_path(source, target):
+    """
+    Returns a shortest path from source to target read off a cached
+    search tree rooted at either of them, or None if neither is cached.
+
+    Raises the same "no solution" exception as shortest_path when the
+    cached tree shows the two are not connected.
+    """
+    if source in trees:
+        trees.move_to_end(source)
+        path = trees[source].path_to(target)
+    elif target in trees:
+        trees.move_to_end(target)
+        path = trees[target].path_to(source)
+        if path is not None:
+            path = reverse_path(path, target)
+    else:
+        return None
+    if path is None:
+        raise Exception("no solution")
+    return path
+
+
+def reverse_path(path, start):
+    """
+    Reverses a list of (movie_id, person_id) pairs leading away from
+    start, so that it leads back to start instead.
+    """
+    people_on_path = [start] + [person_id for _, person_id in path]
+    return [(movie_id, people_on_path[i])
+            for i, (movie_id, _) in reversed(list(enumerate(path)))]
+
+
+def all_shortest_paths(source, target, limit=None):
+    """
+    Yields every shortest list of (movie_id, person_id) pairs that
+    connects the source to the target, stopping after limit paths.
+
+    One breadth-first pass records, for each person up to the target's
+    depth, every (movie_id, person_id) step reaching them from the layer
+    before. Paths are then read off that layered graph one at a time,
+    so asking for the first few does not enumerate all of them.
+
+    Yields nothing if the two are not connected.
+    """
+    if not connected(source, target):
+        return
+    depths = {source: 0}
+    parents = {source: []}
+    layer = [source]
+    while layer and target not in depths:
+        next_layer = []
+        for person_id in layer:
+            depth = depths[person_id] + 1
+            for movie_id, neighbor_id in iter_neighbors(person_id):
+                if neighbor_id not in depths:
+                    depths[neighbor_id] = depth
+                    parents[neighbor_id] = []
+                    next_layer.append(neighbor_id)
+                if depths[neighbor_id] == depth:
+                    parents[neighbor_id].append((movie_id, person_id))
+        layer = next_layer
+
+    def paths_to(person_id):
+        if person_id == source:
+            yield []
+            return
+        for movie_id, parent_id in parents[person_id]:
+            for path in paths_to(parent_id):
+                yield path + [(movie_id, person_id)]
+
+    yield from itertools.islice(paths_to(target), limit)
+
+
+@instrumented("astar")
+def shortest_path_astar(source, target, heuristic=None, stats=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, using A* search.
+
+    heuristic(person_id) should give a lower bound on the degrees of
+    separation between person_id and target. By default the landmark
+    bounds are used once build_landmarks has run; without any heuristic
+    this is a plain uniform-cost search.
+
+    If no possible path, returns None.
+    """
+    if not connected(source, target):
+        return None
+    if graph is not None:
+        return astar_numbers(source, target, heuristic, stats)
+    if heuristic is None and landmarks is not None:
+        heuristic = landmarks.heuristic_to(target)
+    goal = best_first_search(
+        source,
+        lambda person_id: person_id == target,
+        lambda person_id: ((movie_id, neighbor_id, 1)
+                           for movie_id, neighbor_id in iter_neighbors(person_id)),
+        heuristic,
+        stats,
+    )
+    return None if goal is None else timed_path(stats, node_path, goal)
+
+
+def astar_numbers(source, target, heuristic=None, stats=None):
+    """
+    A* search for shortest_path_astar on the compact graph, over person
+    and movie numbers rather than ids.
+    """
+    goal_number = graph.person_index[target]
+    if heuristic is not None:
+        by_id = heuristic
+
+        def heuristic(person):
+            return by_id(graph.person_ids[person])
+    elif landmarks is not None:
+        heuristic = landmarks.number_heuristic_to(goal_number)
+
+    def is_goal(person):
+        return person == goal_number
+
+    def edges(person):
+        return ((movie, star, 1)
+                for movie in graph.movies_of(person) for star in graph.stars_of(movie))
+
+    goal = best_first_search(graph.person_index[source], is_goal, edges, heuristic, stats)
+    if goal is None:
+        return None
+    return [(graph.movie_ids[movie], graph.person_ids[person])
+            for movie, person in timed_path(stats, node_path, goal)]
+
+
+@instrumented("bipartite")
+def shortest_path_bipartite(source, target, stats=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching the graph of
+    people and movies so that every movie is expanded exactly once,
+    rather than once per star who appeared in it.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+    if not connected(source, target):
+        return None
+    if graph is not None:
+        return graph.shortest_path(source, target, stats)
+
+    # Maps each reached person_id to the movie_id that reached them,
+    # and each reached movie_id to the person_id that reached it
+    person_parents = {source: None}
+    movie_parents = {}
+    queue = deque([source])
+
+    def neighbors(person_id):
+        for movie_id in movies_for_person(person_id):
+            if movie_id in movie_parents:
+                continue
+            movie_parents[movie_id] = person_id
+            for star_id in stars_for_movie(movie_id):
+                yield movie_id, star_id
+
+    if stats is not None:
+        neighbors = stats.timed(neighbors)
+    while queue:
+        person_id = queue.popleft()
+        if stats is not None:
+            stats.nodes_expanded += 1
+            stats.frontier_size(len(queue) + 1)
+        for movie_id, star_id in neighbors(person_id):
+            if star_id in person_parents:
+                continue
+            person_parents[star_id] = movie_id
+            if star_id == target:
+                return timed_path(stats, bipartite_path, target, person_parents, movie_parents)
+            queue.append(star_id)
+    return None
+
+
+def bipartite_path(target, person_parents, movie_parents):
+    """
+    Follows alternating person and movie parents back from target,
+    returning the (movie_id, person_id) path that reached it.
+    """
+    path = []
+    person_id = target
+    while person_parents[person_id] is not None:
+        movie_id = person_parents[person_id]
+        path.append((movie_id, person_id))
+        person_id = movie_parents[movie_id]
+    path.reverse()
+    return path
+
+
+@instrumented("bidirectional")
+def shortest_path_bidirectional(source, target, stats=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching outward
+    from both people at once until the two searches meet.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+    if not connected(source, target):
+        return None
+
+    # Each side maps a reached person_id to the (movie_id, person_id)
+    # step that reached it, pointing back towards that side's start
+    forward = {source: None}
+    backward = {target: None}
+    forward_layer = [source]
+    backward_layer = [target]
+    forward_movies = set()
+    backward_movies = set()
+
+    while forward_layer and backward_layer:
+        # Always grow the smaller side by one whole layer
+        if len(forward_layer) <= len(backward_layer):
+            forward_layer, meeting = expand_layer(
+                forward_layer, forward, backward, forward_movies, stats)
+        else:
+            backward_layer, meeting = expand_layer(
+                backward_layer, backward, forward, backward_movies, stats)
+        if meeting is not None:
+            return timed_path(stats, join_paths, meeting, forward, backward)
+    return None
+
+
+def expand_layer(layer, reached, other, seen_movies, stats=None):
+    """
+    Expands every person in layer by one step, recording new people
+    in reached and skipping movies this side has already expanded.
+    Returns the next layer, plus the person where this side
+    first meets the other side (or None if the searches have not met).
+
+    The two sides only ever meet on a shortest path, since neither
+    had reached the other before this layer, so the first meeting wins.
+    """
+    neighbors = iter_neighbors if stats is None else stats.timed(iter_neighbors)
+    if stats is not None:
+        stats.frontier_size(len(layer))
+    next_layer = []
+    for person_id in layer:
+        if stats is not None:
+            stats.nodes_expanded += 1
+        for movie_id, neighbor_id in neighbors(person_id, seen_movies):
+            if neighbor_id in reached:
+                continue
+            reached[neighbor_id] = (movie_id, person_id)
+            if neighbor_id in other:
+                return next_layer, neighbor_id
+            next_layer.append(neighbor_id)
+    return next_layer, None
+
+
+def join_paths(meeting, forward, backward):
+    """
+    Joins the forward and backward halves of a bidirectional search
+    that met at meeting into a single source to target path.
+    """
+    path = []
+    person_id = meeting
+    while forward[person_id] is not None:
+        movie_id, previous_id = forward[person_id]
+        path.append((movie_id, person_id))
+        person_id = previous_id
+    path.reverse()
+
+    person_id = meeting
+    while backward[person_id] is not None:
+        movie_id, next_id = backward[person_id]
+        path.append((movie_id, next_id))
+        person_id = next_id
+    return path
+
+
 def person_id_for_name(name):
     """
     Returns the IMDB id for a person's name,
@@ -159,13 +781,50 @@ def neighbors_for_person(person_id):
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
-    movie_ids = people[person_id]["movies"]
+    movie_ids = movies_for_person(person_id)
     neighbors = set()
     for movie_id in movie_ids:
-        for person_id in movies[movie_id]["stars"]:
+        for person_id in stars_for_movie(movie_id):
             neighbors.add((movie_id, person_id))
     return neighbors
 
 
+def iter_neighbors(person_id, seen_movies=None):
+    """
+    Yields (movie_id, person_id) pairs for people who starred with a
+    given person, one movie at a time, so a search can stop as soon as
+    it finds its goal.
+
+    If seen_movies is given, movies already in it are skipped and each
+    new movie is added to it. Every star of a seen movie has already been
+    yielded once, so searches lose nothing by skipping it.
+    """
+    for movie_id in movies_for_person(person_id):
+        if seen_movies is not None:
+            if movie_id in seen_movies:
+                continue
+            seen_movies.add(movie_id)
+        for star_id in stars_for_movie(movie_id):
+            yield movie_id, star_id
+
+
+def movies_for_person(person_id):
+    """
+    Returns the movie_ids of the movies a person starred in.
+    """
+    if graph is not None:
+        return graph.movies_for_person(person_id)
+    return people[person_id]["movies"]
+
+
+def stars_for_movie(movie_id):
+    """
+    Returns the person_ids of the people who starred in a movie.
+    """
+    if graph is not None:
+        return graph.stars_for_movie(movie_id)
+    return movies[movie_id]["stars"]
+
+
 if __name__ == "__main__":
     main()
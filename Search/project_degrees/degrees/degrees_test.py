@@ -0,0 +1,355 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import degrees
+import snapshot
+
+PEOPLE = [("1", "Alice", "1960"), ("2", "Bob", "1961"), ("3", "Carol", "1962"),
+          ("4", "Dave", "1963"), ("5", "Erin", "1964"), ("6", "Frank", "1965"),
+          ("7", "Grace", "1966"), ("8", "Heidi", "1967"), ("9", "Alice", "1980")]
+MOVIES = [("10", "First", "2000"), ("11", "Second", "2001"), ("12", "Third", "2002"),
+          ("13", "Fourth", "2003"), ("14", "Fifth", "2004"), ("15", "Sixth", "2005")]
+STARS = [("1", "10"), ("2", "10"), ("2", "11"), ("3", "11"), ("3", "12"), ("4", "12"),
+         ("1", "13"), ("5", "13"), ("5", "14"), ("4", "14"), ("7", "15"), ("8", "15")]
+
+
+def write_data(directory, stars=STARS):
+    for filename, header, rows in (("people.csv", ("id", "name", "birth"), PEOPLE),
+                                   ("movies.csv", ("id", "title", "year"), MOVIES),
+                                   ("stars.csv", ("person_id", "movie_id"), stars)):
+        with open(os.path.join(directory, filename), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+class DegreesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        write_data(self.directory.name)
+        degrees.names.clear()
+        degrees.people.clear()
+        degrees.movies.clear()
+        degrees.load_data(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_shortest_path(self):
+        path = degrees.shortest_path("1", "4")
+        self.assertEqual(path, [("13", "5"), ("14", "4")])
+
+    def test_repeated_source_cached(self):
+        degrees.shortest_path("1", "4")
+        self.assertNotIn("1", degrees.trees)
+        self.assertEqual(len(degrees.shortest_path("1", "3")), 2)
+        self.assertIn("1", degrees.trees)
+        self.assertEqual(degrees.shortest_path("1", "4"), [("13", "5"), ("14", "4")])
+        with self.assertRaises(Exception):
+            degrees.shortest_path("1", "7")
+
+    def test_bidirectional_matches_bfs(self):
+        for source in ("1", "2", "3", "4", "5"):
+            for target in ("1", "2", "3", "4", "5"):
+                path = degrees.shortest_path_bidirectional(source, target)
+                self.assertEqual(len(path), len(degrees.shortest_path(source, target)))
+                self.assertPathValid(source, target, path)
+
+    def test_bipartite_matches_bfs(self):
+        for source in ("1", "2", "3", "4", "5"):
+            for target in ("1", "2", "3", "4", "5"):
+                path = degrees.shortest_path_bipartite(source, target)
+                self.assertEqual(len(path), len(degrees.shortest_path(source, target)))
+                self.assertPathValid(source, target, path)
+        self.assertIsNone(degrees.shortest_path_bipartite("1", "7"))
+
+    def test_all_shortest_paths(self):
+        # With Carol in Fifth as well, Alice reaches her through Bob or Erin
+        with tempfile.TemporaryDirectory() as directory:
+            write_data(directory, STARS + [("3", "14")])
+            for compact in (False, True):
+                degrees.people, degrees.names, degrees.movies = {}, {}, {}
+                degrees.load_data(directory, compact=compact)
+                paths = list(degrees.all_shortest_paths("1", "3"))
+                self.assertCountEqual(paths, [[("10", "2"), ("11", "3")], [("13", "5"), ("14", "3")]])
+                self.assertEqual(len(list(degrees.all_shortest_paths("1", "3", limit=1))), 1)
+                self.assertEqual(list(degrees.all_shortest_paths("1", "1")), [[]])
+                self.assertEqual(list(degrees.all_shortest_paths("1", "7")), [])
+            degrees.graph = None
+
+    def test_astar_matches_bfs(self):
+        exact = degrees.search_tree("4")
+        for source in ("1", "2", "3", "4", "5"):
+            for heuristic in (None, exact.distance):
+                path = degrees.shortest_path_astar(source, "4", heuristic)
+                self.assertEqual(len(path), exact.distance(source))
+                self.assertPathValid(source, "4", path)
+        self.assertIsNone(degrees.shortest_path_astar("1", "7"))
+
+    def test_landmark_bounds(self):
+        degrees.build_landmarks(landmark_ids=["2", "7"])
+        for source in ("1", "2", "3", "4", "5"):
+            for target in ("1", "2", "3", "4", "5"):
+                lower, upper = degrees.separation_bounds(source, target)
+                distance = degrees.search_tree(source).distance(target)
+                self.assertLessEqual(lower, distance)
+                self.assertGreaterEqual(upper, distance)
+        self.assertEqual(degrees.separation_bounds("2", "4"), (2, 2))
+        self.assertIsNone(degrees.separation_bounds("1", "8"))
+
+    def test_astar_with_landmarks(self):
+        degrees.build_landmarks(count=2)
+        self.assertEqual(len(degrees.landmarks.landmarks), 2)
+        for source in ("1", "2", "3", "5"):
+            path = degrees.shortest_path_astar(source, "4")
+            self.assertEqual(len(path), degrees.search_tree("4").distance(source))
+            self.assertPathValid(source, "4", path)
+
+    def test_landmarks_on_long_chain(self):
+        # Person i and i + 1 share movie i, so person 0 is 199 degrees from person 199
+        with tempfile.TemporaryDirectory() as directory:
+            for filename, header, rows in (
+                    ("people.csv", ("id", "name", "birth"), [(str(i), f"P{i}", "") for i in range(200)]),
+                    ("movies.csv", ("id", "title", "year"), [(str(i), f"M{i}", "") for i in range(199)]),
+                    ("stars.csv", ("person_id", "movie_id"),
+                     [(str(i + step), str(i)) for i in range(199) for step in (0, 1)])):
+                with open(os.path.join(directory, filename), "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(header)
+                    writer.writerows(rows)
+            for compact in (False, True):
+                degrees.people, degrees.names, degrees.movies = {}, {}, {}
+                degrees.load_data(directory, compact=compact)
+                degrees.build_landmarks(landmark_ids=["0", "100"])
+                # Landmark "0" only knows person "199" is at least 127 away
+                self.assertEqual(degrees.separation_bounds("0", "199"), (127, 199))
+                lower, upper = degrees.separation_bounds("10", "190")
+                self.assertLessEqual(lower, 180)
+                self.assertGreaterEqual(upper, 180)
+                self.assertEqual(len(degrees.shortest_path_astar("0", "199")), 199)
+            degrees.graph = None
+
+    def test_bidirectional_not_connected(self):
+        self.assertIsNone(degrees.shortest_path_bidirectional("1", "7"))
+        self.assertIsNone(degrees.shortest_path_bidirectional("1", "6"))
+
+    def test_batch(self):
+        out = io.StringIO()
+        degrees.run_batch(self.directory.name, ["1,4\n", "Dave,Alice\n", "1,7\n", "1,99\n"], out, processes=2)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([record.get("degrees") for record in records], [2, None, None, None])
+        self.assertEqual(records[0]["path"], [["13", "5"], ["14", "4"]])
+        self.assertIn("error", records[1])
+        self.assertNotIn("error", records[2])
+        self.assertIn("error", records[3])
+
+    def test_batch_without_fork(self):
+        # Workers must load the data themselves when they cannot fork
+        out = io.StringIO()
+        with mock.patch("multiprocessing.get_all_start_methods", return_value=["spawn"]):
+            degrees.run_batch(self.directory.name, ["1,4\n"], out, processes=1)
+        self.assertEqual(json.loads(out.getvalue())["path"], [["13", "5"], ["14", "4"]])
+
+    def test_iter_neighbors(self):
+        self.assertEqual(set(degrees.iter_neighbors("3")), degrees.neighbors_for_person("3"))
+        seen_movies = {"11"}
+        self.assertEqual(set(degrees.iter_neighbors("3", seen_movies)), {("12", "3"), ("12", "4")})
+        self.assertEqual(seen_movies, {"11", "12"})
+        self.assertEqual(set(degrees.iter_neighbors("2", seen_movies)), {("10", "1"), ("10", "2")})
+
+    def test_name_prefix(self):
+        self.assertEqual(sorted(degrees.name_index.search_prefix("AL")), ["1", "9"])
+        self.assertEqual(degrees.name_index.search_prefix("d"), ["4"])
+        self.assertEqual(degrees.name_index.search_prefix("al", limit=1), degrees.name_index.search_prefix("alice")[:1])
+        self.assertEqual(degrees.name_index.search_prefix("x"), [])
+
+    def test_name_fuzzy(self):
+        self.assertEqual(degrees.name_index.search_fuzzy("Dav"), [(1, "4")])
+        self.assertEqual(sorted(degrees.name_index.search_fuzzy("alise", max_distance=1)), [(1, "1"), (1, "9")])
+        self.assertEqual(degrees.name_index.search_fuzzy("Grace"), [(0, "7")])
+        self.assertEqual(degrees.name_index.search_fuzzy("zzzzzz"), [])
+
+    def test_connected(self):
+        self.assertTrue(degrees.connected("1", "4"))
+        self.assertTrue(degrees.connected("7", "8"))
+        self.assertTrue(degrees.connected("6", "6"))
+        self.assertFalse(degrees.connected("1", "7"))
+        self.assertFalse(degrees.connected("1", "6"))
+
+    def test_search_tree(self):
+        tree = degrees.search_tree("1")
+        self.assertEqual(tree.distance("4"), 2)
+        self.assertEqual(tree.distance("3"), 2)
+        self.assertIsNone(tree.distance("7"))
+        self.assertNotIn("6", tree)
+        self.assertEqual(tree.path_to("4"), [("13", "5"), ("14", "4")])
+        self.assertIs(degrees.search_tree("1"), tree)
+
+    def test_shortest_path_from_cached_tree(self):
+        degrees.search_tree("4")
+        for source in ("1", "2", "3", "5"):
+            path = degrees.shortest_path(source, "4")
+            self.assertEqual(len(path), degrees.search_tree("4").distance(source))
+            self.assertPathValid(source, "4", path)
+        with self.assertRaises(Exception):
+            degrees.shortest_path("7", "4")
+
+    def test_search_tree_cache_bounded(self):
+        for person_id in ("1", "2", "3", "4", "5", "6", "7", "8", "9"):
+            degrees.search_tree(person_id)
+        self.assertEqual(len(degrees.trees), degrees.TREE_CACHE_SIZE)
+        self.assertNotIn("1", degrees.trees)
+
+    def test_stats_hook(self):
+        records = []
+        degrees.stats_hook = records.append
+        try:
+            degrees.shortest_path("1", "3")
+            degrees.shortest_path_bidirectional("1", "3")
+            degrees.shortest_path_bipartite("1", "3")
+            degrees.shortest_path_astar("1", "3")
+        finally:
+            degrees.stats_hook = None
+        self.assertEqual([record["search"] for record in records],
+                         ["bfs", "bidirectional", "bipartite", "astar"])
+        for record in records:
+            self.assertEqual((record["source"], record["target"], record["path_length"]), ("1", "3", 2))
+            self.assertGreater(record["nodes_expanded"], 0)
+            self.assertGreater(record["frontier_peak"], 0)
+            self.assertGreaterEqual(record["neighbor_seconds"], 0)
+            self.assertGreaterEqual(record["path_seconds"], 0)
+
+    def test_stats_json_lines(self):
+        out = io.StringIO()
+        degrees.stats_hook = degrees.json_stats_hook(out)
+        try:
+            with self.assertRaises(Exception):
+                degrees.shortest_path("1", "7")
+            degrees.shortest_path("2", "4")
+        finally:
+            degrees.stats_hook = None
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([record["path_length"] for record in records], [None, 2])
+
+    def assertPathValid(self, source, target, path):
+        person_id = source
+        for movie_id, next_id in path:
+            self.assertIn(person_id, degrees.stars_for_movie(movie_id))
+            self.assertIn(next_id, degrees.stars_for_movie(movie_id))
+            person_id = next_id
+        self.assertEqual(person_id, target)
+
+
+class CompactDegreesTest(DegreesTest):
+    def setUp(self):
+        super().setUp()
+        degrees.load_data(self.directory.name, compact=True)
+
+    def tearDown(self):
+        super().tearDown()
+        degrees.graph = None
+
+    def test_compact_neighbors(self):
+        self.assertEqual(degrees.neighbors_for_person("3"),
+                         {("11", "2"), ("11", "3"), ("12", "3"), ("12", "4")})
+        self.assertNotIn("movies", degrees.people["3"])
+
+    def test_compact_not_connected(self):
+        with self.assertRaises(Exception):
+            degrees.shortest_path("1", "7")
+
+
+class SnapshotDegreesTest(DegreesTest):
+    def setUp(self):
+        super().setUp()
+        degrees.load_data(self.directory.name, snapshot=True)
+        degrees.load_data(self.directory.name, snapshot=True)
+
+    def tearDown(self):
+        super().tearDown()
+        degrees.graph = None
+        degrees.people, degrees.names, degrees.movies = {}, {}, {}
+
+    def test_snapshot_loaded(self):
+        self.assertTrue(os.path.exists(snapshot.snapshot_path(self.directory.name)))
+        self.assertNotIsInstance(degrees.people, dict)
+        self.assertEqual(degrees.people["4"], {"name": "Dave", "birth": "1963"})
+        self.assertEqual(degrees.movies["12"], {"title": "Third", "year": "2002"})
+        self.assertNotIn("99", degrees.people)
+
+    def test_snapshot_names(self):
+        self.assertEqual(degrees.names.get("alice"), {"1", "9"})
+        self.assertEqual(degrees.person_id_for_name("Dave"), "4")
+        self.assertIsNone(degrees.person_id_for_name("Nobody"))
+
+    def test_snapshot_invalidated(self):
+        with open(os.path.join(self.directory.name, "people.csv"), "a", encoding="utf-8") as f:
+            f.write("20,Ivan,1970\n")
+        self.assertIsNone(snapshot.read_snapshot(self.directory.name))
+        degrees.load_data(self.directory.name, snapshot=True)
+        self.assertEqual(degrees.person_id_for_name("Ivan"), "20")
+
+    def test_snapshot_damaged(self):
+        path = snapshot.snapshot_path(self.directory.name)
+        with open(path, "rb") as f:
+            data = f.read()
+        damaged = (data[:len(snapshot.MAGIC) + 4] + b"{not json" + data[len(snapshot.MAGIC) + 13:],
+                   data[:len(snapshot.MAGIC) + 2],
+                   data[:len(data) // 2])
+        for contents in damaged:
+            with open(path, "wb") as f:
+                f.write(contents)
+            self.assertIsNone(snapshot.read_snapshot(self.directory.name))
+            degrees.load_data(self.directory.name, snapshot=True)
+            self.assertEqual(degrees.person_id_for_name("Dave"), "4")
+            self.assertIsNotNone(snapshot.read_snapshot(self.directory.name))
+
+
+class StreamingDegreesTest(DegreesTest):
+    def setUp(self):
+        super().setUp()
+        degrees.load_data(self.directory.name, streaming=True)
+
+    def tearDown(self):
+        super().tearDown()
+        degrees.graph = None
+        degrees.people, degrees.names, degrees.movies = {}, {}, {}
+
+    def test_streaming_records(self):
+        self.assertNotIsInstance(degrees.people, dict)
+        self.assertEqual(degrees.people["9"], {"name": "Alice", "birth": "1980"})
+        self.assertEqual(degrees.movies["15"], {"title": "Sixth", "year": "2005"})
+        self.assertEqual(degrees.person_id_for_name("carol"), "3")
+        with self.assertRaises(KeyError):
+            degrees.people["99"]
+
+    def test_streaming_quoted_fields(self):
+        with open(os.path.join(self.directory.name, "movies.csv"), "a", newline="", encoding="utf-8") as f:
+            f.write("\r\n")
+            csv.writer(f).writerow(("16", "Comma, \"Quotes\"\n\nand lines", "2006"))
+            f.write("\r\n\r\n")
+            csv.writer(f).writerow(("17", "Last", "2007"))
+        degrees.load_data(self.directory.name, streaming=True)
+        self.assertEqual(degrees.movies["16"]["title"], "Comma, \"Quotes\"\n\nand lines")
+        self.assertEqual(degrees.movies["17"], {"title": "Last", "year": "2007"})
+        self.assertEqual(degrees.movies["15"], {"title": "Sixth", "year": "2005"})
+
+    def test_streaming_blank_lines(self):
+        path = os.path.join(self.directory.name, "people.csv")
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+        lines.insert(4, "\n")
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        degrees.load_data(self.directory.name, streaming=True)
+        for person_id, name, birth in PEOPLE:
+            self.assertEqual(degrees.people[person_id], {"name": name, "birth": birth})
+
+
+if __name__ == "__main__":
+    unittest.main()
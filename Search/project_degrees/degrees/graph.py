@@ -0,0 +1,287 @@
+import time
+from array import array
+from collections import deque
+
+
+class Graph():
+    """
+    Compact actor-movie graph.
+
+    People and movies are numbered 0..n-1 in load order, and adjacency is
+    stored in compressed sparse row form: the movies of person p are
+    person_movies[person_offsets[p]:person_offsets[p + 1]], and the stars
+    of movie m are movie_stars[movie_offsets[m]:movie_offsets[m + 1]].
+    """
+
+    def __init__(self, person_ids, movie_ids, person_offsets, person_movies,
+                 movie_offsets, movie_stars, person_index=None, movie_index=None,
+                 components=None):
+        self.person_ids = person_ids
+        self.movie_ids = movie_ids
+        if person_index is None:
+            person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+        if movie_index is None:
+            movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+        self.person_index = person_index
+        self.movie_index = movie_index
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+        # Connected component label of every person
+        if components is None:
+            components = label_components(
+                len(person_ids), (self.stars_of(movie) for movie in range(len(movie_ids))))
+        self.components = components
+
+    @classmethod
+    def from_stars(cls, person_ids, movie_ids, stars):
+        """
+        Builds a graph from lists of person and movie ids plus an iterable
+        of (person_number, movie_number) star credits. Repeated credits
+        are only stored once.
+        """
+        people = array("i")
+        movies = array("i")
+        for person, movie in stars:
+            people.append(person)
+            movies.append(movie)
+        return cls.from_credits(person_ids, movie_ids, people, movies)
+
+    @classmethod
+    def from_credits(cls, person_ids, movie_ids, people, movies,
+                     person_index=None, movie_index=None):
+        """
+        Builds a graph from parallel arrays of person and movie numbers,
+        one entry per star credit. Repeated credits are only stored once.
+        """
+        person_offsets, person_movies = unique_rows(
+            *compress(len(person_ids), people, movies))
+
+        # Rebuild the credits from the de-duplicated rows, in person order,
+        # so each movie's stars come out sorted as well
+        people = array("i")
+        for person in range(len(person_ids)):
+            people.extend(array("i", [person]) * (person_offsets[person + 1] - person_offsets[person]))
+        movie_offsets, movie_stars = compress(len(movie_ids), person_movies, people)
+        return cls(person_ids, movie_ids, person_offsets, person_movies,
+                   movie_offsets, movie_stars,
+                   person_index=person_index, movie_index=movie_index)
+
+    def movies_of(self, person):
+        """
+        Returns the numbers of the movies person number person starred in.
+        """
+        return self.person_movies[self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def stars_of(self, movie):
+        """
+        Returns the numbers of the people who starred in movie number movie.
+        """
+        return self.movie_stars[self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def movies_for_person(self, person_id):
+        """
+        Returns the movie_ids of the movies a person starred in.
+        """
+        return [self.movie_ids[movie] for movie in self.movies_of(self.person_index[person_id])]
+
+    def stars_for_movie(self, movie_id):
+        """
+        Returns the person_ids of the people who starred in a movie.
+        """
+        return [self.person_ids[person] for person in self.stars_of(self.movie_index[movie_id])]
+
+    def connected(self, source, target):
+        """
+        Returns True if there is any path between source and target.
+        """
+        return (self.components[self.person_index[source]]
+                == self.components[self.person_index[target]])
+
+    def shortest_path(self, source, target, stats=None):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target, searching entirely
+        on person and movie numbers. Work done is counted in stats,
+        if given.
+
+        If no possible path, returns None.
+        """
+        start = self.person_index[source]
+        goal = self.person_index[target]
+        if start == goal:
+            return []
+        if self.components[start] != self.components[goal]:
+            return None
+
+        # -1 marks a person the search has not reached yet. Movies are
+        # nodes of their own, so each movie's stars are only scanned once
+        parent_person = array("i", [-1]) * len(self.person_ids)
+        parent_movie = array("i", [-1]) * len(self.person_ids)
+        seen_movies = bytearray(len(self.movie_ids))
+        parent_person[start] = start
+        queue = deque([start])
+        while queue:
+            if stats is not None:
+                stats.nodes_expanded += 1
+                stats.frontier_size(len(queue))
+                started = time.perf_counter()
+            person = queue.popleft()
+            for movie in self.movies_of(person):
+                if seen_movies[movie]:
+                    continue
+                seen_movies[movie] = 1
+                for star in self.stars_of(movie):
+                    if parent_person[star] != -1:
+                        continue
+                    parent_person[star] = person
+                    parent_movie[star] = movie
+                    if star == goal:
+                        if stats is None:
+                            return self.trace(start, goal, parent_person, parent_movie)
+                        traced = time.perf_counter()
+                        stats.neighbor_seconds += traced - started
+                        path = self.trace(start, goal, parent_person, parent_movie)
+                        stats.path_seconds += time.perf_counter() - traced
+                        return path
+                    queue.append(star)
+            if stats is not None:
+                stats.neighbor_seconds += time.perf_counter() - started
+        return None
+
+    def search_tree(self, source):
+        """
+        Runs a breadth-first search from source over the whole graph,
+        returning the Tree of every person it reaches.
+        """
+        start = self.person_index[source]
+        tree = Tree(self, start)
+        seen_movies = bytearray(len(self.movie_ids))
+        queue = deque([start])
+        while queue:
+            person = queue.popleft()
+            distance = tree.distances[person] + 1
+            for movie in self.movies_of(person):
+                if seen_movies[movie]:
+                    continue
+                seen_movies[movie] = 1
+                for star in self.stars_of(movie):
+                    if tree.distances[star] != -1:
+                        continue
+                    tree.distances[star] = distance
+                    tree.parent_person[star] = person
+                    tree.parent_movie[star] = movie
+                    queue.append(star)
+        return tree
+
+    def trace(self, start, goal, parent_person, parent_movie):
+        """
+        Follows parent pointers back from goal to start, returning the
+        (movie_id, person_id) path between them.
+        """
+        path = []
+        person = goal
+        while person != start:
+            path.append((self.movie_ids[parent_movie[person]], self.person_ids[person]))
+            person = parent_person[person]
+        path.reverse()
+        return path
+
+
+class Tree():
+    """
+    Breadth-first search tree over a Graph, holding the distance from the
+    root and the parent person and movie of every person as arrays.
+    """
+
+    def __init__(self, graph, root):
+        self.graph = graph
+        self.root = root
+        # -1 marks a person the search never reached
+        self.distances = array("i", [-1]) * len(graph.person_ids)
+        self.parent_person = array("i", [-1]) * len(graph.person_ids)
+        self.parent_movie = array("i", [-1]) * len(graph.person_ids)
+        self.distances[root] = 0
+
+    def __contains__(self, person_id):
+        return self.distance(person_id) is not None
+
+    def __len__(self):
+        return len(self.distances) - self.distances.count(-1)
+
+    def distance(self, person_id):
+        distance = self.distances[self.graph.person_index[person_id]]
+        return None if distance == -1 else distance
+
+    def path_to(self, person_id):
+        """
+        Returns the (movie_id, person_id) pairs leading from the root
+        to person_id, or None if person_id was never reached.
+        """
+        person = self.graph.person_index[person_id]
+        if self.distances[person] == -1:
+            return None
+        return self.graph.trace(self.root, person, self.parent_person, self.parent_movie)
+
+
+def compress(count, sources, targets):
+    """
+    Groups targets by their source number, returning the (offsets, edges)
+    arrays of a compressed sparse row adjacency over count sources.
+    """
+    offsets = array("i", [0]) * (count + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+
+    edges = array("i", [0]) * len(sources)
+    position = offsets[:-1]
+    for source, target in zip(sources, targets):
+        edges[position[source]] = target
+        position[source] += 1
+    return offsets, edges
+
+
+def unique_rows(offsets, edges):
+    """
+    Sorts each row of a compressed sparse row adjacency and drops
+    repeated edges, returning the new (offsets, edges) arrays.
+    """
+    unique_offsets = array("i", [0]) * len(offsets)
+    unique_edges = array("i")
+    for row in range(len(offsets) - 1):
+        unique_edges.extend(sorted(set(edges[offsets[row]:offsets[row + 1]])))
+        unique_offsets[row + 1] = len(unique_edges)
+    return unique_offsets, unique_edges
+
+
+def label_components(count, groups):
+    """
+    Labels count numbered members by connected component, given groups
+    of members that are all connected to each other. Returns an array
+    where members share a label exactly when they are connected.
+    """
+    # Union-find forest, flattened into labels at the end
+    parent = array("i", range(count))
+
+    def find(member):
+        while parent[member] != member:
+            parent[member] = parent[parent[member]]
+            member = parent[member]
+        return member
+
+    for group in groups:
+        root = None
+        for member in group:
+            if root is None:
+                root = find(member)
+                continue
+            other = find(member)
+            if other != root:
+                parent[other] = root
+
+    for member in range(count):
+        parent[member] = find(member)
+    return parent
@@ -0,0 +1,108 @@
+from array import array
+
+# Marks a person a landmark cannot reach
+UNREACHABLE = -1
+
+# Distances saturate here, the largest an int8 can hold; a stored FAR
+# only says the true distance is at least FAR
+FAR = 127
+
+
+class LandmarkIndex():
+    """
+    Distances from a few landmark people to everyone else.
+
+    By the triangle inequality, for any landmark L the degrees of
+    separation d(s, t) between two people satisfy
+
+        |d(L, s) - d(L, t)| <= d(s, t) <= d(L, s) + d(L, t)
+
+    so the index bounds any pair's separation in O(#landmarks). Distances
+    are stored as one int8 array per landmark, indexed by person number,
+    and saturate at FAR. A saturated distance still gives a valid lower
+    bound against an exact one, but is left out of upper bounds.
+    """
+
+    def __init__(self, person_index, landmarks, distances):
+        self.person_index = person_index
+        self.landmarks = landmarks
+        self.distances = distances
+
+    @classmethod
+    def build(cls, person_index, landmarks, tree_for):
+        """
+        Builds the index for the given landmark person_ids, where
+        person_index maps every person_id to its person number and
+        tree_for(person_id) returns a search tree rooted at that person.
+
+        Trees that already hold their distances as an array in person
+        number order, like graph.Tree, are copied without a lookup per
+        person.
+        """
+        distances = []
+        for landmark in landmarks:
+            tree = tree_for(landmark)
+            if hasattr(tree, "distances"):
+                row = saturated(tree.distances)
+            else:
+                row = array("b", [UNREACHABLE]) * len(person_index)
+                for person_id, i in person_index.items():
+                    distance = tree.distance(person_id)
+                    if distance is not None:
+                        row[i] = min(distance, FAR)
+            distances.append(row)
+        return cls(person_index, list(landmarks), distances)
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the degrees of separation between
+        source and target. upper is None if no landmark reaches them both.
+
+        Returns None if some landmark shows they are not connected.
+        """
+        s = self.person_index[source]
+        t = self.person_index[target]
+        lower = 0
+        upper = None
+        for row in self.distances:
+            to_source = row[s]
+            to_target = row[t]
+            if to_source == UNREACHABLE and to_target == UNREACHABLE:
+                continue
+            if to_source == UNREACHABLE or to_target == UNREACHABLE:
+                return None
+            lower = max(lower, abs(to_source - to_target))
+            if to_source == FAR or to_target == FAR:
+                continue
+            if upper is None or to_source + to_target < upper:
+                upper = to_source + to_target
+        return lower, upper
+
+    def heuristic_to(self, target):
+        """
+        Returns a function giving a lower bound on the distance from any
+        person to target, for use as an A* heuristic.
+        """
+        heuristic = self.number_heuristic_to(self.person_index[target])
+        return lambda person_id: heuristic(self.person_index[person_id])
+
+    def number_heuristic_to(self, t):
+        """
+        Like heuristic_to, for a target and people given by person number.
+        """
+        rows = [(row, row[t]) for row in self.distances if row[t] != UNREACHABLE]
+
+        def heuristic(s):
+            return max((abs(row[s] - to_target) for row, to_target in rows
+                        if row[s] != UNREACHABLE), default=0)
+
+        return heuristic
+
+
+def saturated(distances):
+    """
+    Returns an int8 copy of an array of distances, capping them at FAR.
+    """
+    if max(distances, default=0) <= FAR:
+        return array("b", distances)
+    return array("b", [min(distance, FAR) for distance in distances])
@@ -0,0 +1,79 @@
+"""
+Measures the latency of a running degrees server under concurrent load.
+
+Usage: python loadtest.py [directory] [requests] [concurrency] [port]
+
+Random pairs of people are drawn from directory and sent to /path.
+"""
+import asyncio
+import statistics
+import sys
+import time
+from urllib.parse import urlencode
+
+import degrees
+from benchmark import random_pairs
+
+
+async def fetch(port, path):
+    """
+    Sends one GET request and returns (status, seconds taken).
+    """
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1]), time.perf_counter() - start
+
+
+async def run(port, pairs, concurrency):
+    """
+    Sends a /path request for every pair, at most concurrency at a time,
+    and returns each request's (status, seconds taken).
+    """
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(source, target):
+        async with limit:
+            return await fetch(port, "/path?" + urlencode({"source": source, "target": target}))
+
+    return await asyncio.gather(*(one(source, target) for source, target in pairs))
+
+
+def percentile(values, fraction):
+    """
+    Returns the value below which the given fraction of values fall.
+    """
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    if len(sys.argv) > 5:
+        sys.exit("Usage: python loadtest.py [directory] [requests] [concurrency] [port]")
+    directory = sys.argv[1] if len(sys.argv) > 1 else "large"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    port = int(sys.argv[4]) if len(sys.argv) > 4 else 8050
+
+    degrees.load_data(directory, snapshot=True)
+    pairs = random_pairs(count)
+
+    start = time.perf_counter()
+    results = asyncio.run(run(port, pairs, concurrency))
+    elapsed = time.perf_counter() - start
+
+    latencies = [seconds * 1000 for _, seconds in results]
+    failures = sum(1 for status, _ in results if status != 200)
+    print(f"{count} requests, {concurrency} concurrent, {elapsed:.2f}s total, "
+          f"{count / elapsed:.1f} requests/s, {failures} failed")
+    print(f"p50: {percentile(latencies, 0.5):.1f}ms  "
+          f"p99: {percentile(latencies, 0.99):.1f}ms  "
+          f"mean: {statistics.mean(latencies):.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
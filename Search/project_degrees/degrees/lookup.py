@@ -0,0 +1,132 @@
+import bisect
+from array import array
+from collections.abc import Mapping
+
+
+def name_order(person_names):
+    """
+    Returns the person numbers sorted by lower-cased name.
+    """
+    return array("i", sorted(range(len(person_names)), key=lambda i: person_names[i].lower()))
+
+
+class NameIndex(Mapping):
+    """
+    Sorted index of people's names.
+
+    Maps lower-cased names to the set of person_ids with that name, like
+    the names dictionary in degrees.py, and also finds names by prefix
+    or by edit distance. person_ids and person_names are indexed by person
+    number, and order lists person numbers sorted by lower-cased name.
+    """
+
+    def __init__(self, person_ids, person_names, order):
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.order = order
+
+    def lower_name(self, number):
+        return self.person_names[number].lower()
+
+    def key(self, i):
+        """
+        Returns the i-th lower-cased name in sorted order.
+        """
+        return self.lower_name(self.order[i])
+
+    def __getitem__(self, key):
+        i = bisect.bisect_left(self.order, key, key=self.lower_name)
+        person_ids = set()
+        while i < len(self.order) and self.key(i) == key:
+            person_ids.add(self.person_ids[self.order[i]])
+            i += 1
+        if not person_ids:
+            raise KeyError(key)
+        return person_ids
+
+    def __iter__(self):
+        seen = None
+        for number in self.order:
+            name = self.lower_name(number)
+            if name != seen:
+                seen = name
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def search_prefix(self, prefix, limit=10):
+        """
+        Returns up to limit person_ids whose name starts with prefix,
+        ignoring case, in name order.
+        """
+        prefix = prefix.lower()
+        i = bisect.bisect_left(self.order, prefix, key=self.lower_name)
+        person_ids = []
+        while i < len(self.order) and len(person_ids) < limit and self.key(i).startswith(prefix):
+            person_ids.append(self.person_ids[self.order[i]])
+            i += 1
+        return person_ids
+
+    def search_fuzzy(self, name, max_distance=2, limit=10):
+        """
+        Returns up to limit (distance, person_id) pairs for people whose
+        name is within max_distance edits of name, ignoring case, closest
+        first.
+
+        The sorted names are walked as if they were a trie: neighbouring
+        names share the edit distance rows of their common prefix, and once
+        every entry of a row is over max_distance, all names sharing that
+        prefix are skipped with a single bisect.
+        """
+        query = name.lower()
+        matches = []
+        # rows[d] is the edit distance row for the first d letters of current
+        rows = [list(range(len(query) + 1))]
+        current = ""
+        i = 0
+        while i < len(self.order):
+            key = self.key(i)
+            common = 0
+            while common < len(current) and common < len(key) and current[common] == key[common]:
+                common += 1
+            del rows[common + 1:]
+
+            pruned = False
+            for depth in range(common, len(key)):
+                rows.append(next_row(rows[-1], key[depth], query))
+                if min(rows[-1]) > max_distance:
+                    pruned = True
+                    break
+            current = key[:len(rows) - 1]
+
+            if pruned:
+                # No name starting with current can come back within range
+                i = bisect.bisect_left(self.order, successor(current), lo=i, key=self.lower_name)
+                continue
+            if rows[-1][-1] <= max_distance:
+                matches.append((rows[-1][-1], key, self.person_ids[self.order[i]]))
+            i += 1
+
+        matches.sort()
+        return [(distance, person_id) for distance, _, person_id in matches[:limit]]
+
+
+def next_row(row, letter, query):
+    """
+    Extends a Levenshtein distance row against query by one more letter.
+    """
+    new_row = [row[0] + 1]
+    for j, query_letter in enumerate(query, 1):
+        new_row.append(min(new_row[j - 1] + 1,
+                           row[j] + 1,
+                           row[j - 1] + (query_letter != letter)))
+    return new_row
+
+
+def successor(prefix):
+    """
+    Returns the smallest string that sorts after every string starting
+    with prefix.
+    """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
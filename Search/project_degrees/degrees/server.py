@@ -0,0 +1,149 @@
+"""
+HTTP front-end for degrees queries.
+
+Usage: python server.py [directory] [port]
+
+    GET /path?source=...&target=...   shortest path between two people
+    GET /person?name=...              people with, or close to, a name
+
+People may be given as person_ids or as unambiguous names. Responses
+are JSON. Searches run in a pool of worker processes that share the
+loaded data, so the event loop keeps answering while they work.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import degrees
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+SUGGESTIONS = 10
+WARM_UP_SECONDS = 0.05
+
+
+async def respond(method, target, pool):
+    """
+    Answers a single request, returning its (status, body).
+    """
+    if method != "GET":
+        return 405, {"error": "only GET is supported"}
+    url = urlsplit(target)
+    query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+    if url.path == "/path":
+        if "source" not in query or "target" not in query:
+            return 400, {"error": "source and target are required"}
+        pair = degrees.parse_pair([query["source"], query["target"]])
+        loop = asyncio.get_running_loop()
+        record = await loop.run_in_executor(pool, degrees.solve_pair, pair)
+        return (404 if "error" in record else 200), record
+
+    if url.path == "/person":
+        if "name" not in query:
+            return 400, {"error": "name is required"}
+        # Suggestions scan the whole name index, so keep them off the loop
+        loop = asyncio.get_running_loop()
+        return 200, await loop.run_in_executor(pool, find_person, query["name"])
+
+    return 404, {"error": f"no such endpoint: {url.path}"}
+
+
+def find_person(name):
+    """
+    Returns the people called name, plus suggestions when there are none.
+    """
+    matches = degrees.names.get(name.lower(), set())
+    body = {"matches": [describe(person_id) for person_id in sorted(matches)]}
+    if not matches:
+        suggestions = degrees.name_index.search_prefix(name, limit=SUGGESTIONS)
+        for _, person_id in degrees.name_index.search_fuzzy(name, limit=SUGGESTIONS):
+            if person_id not in suggestions:
+                suggestions.append(person_id)
+        body["suggestions"] = [describe(person_id) for person_id in suggestions[:SUGGESTIONS]]
+    return body
+
+
+def describe(person_id):
+    person = degrees.people[person_id]
+    return {"id": person_id, "name": person["name"], "birth": person["birth"]}
+
+
+async def handle(reader, writer, pool):
+    """
+    Reads one HTTP request from a connection and writes its response.
+    """
+    try:
+        request_line = await reader.readline()
+        # Nothing in the headers changes the answer, so skip them
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            status, body = await respond(method, target, pool)
+        except ValueError:
+            status, body = 400, {"error": "malformed request"}
+
+        payload = json.dumps(body).encode("utf-8")
+        writer.write((f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                      "Content-Type: application/json\r\n"
+                      f"Content-Length: {len(payload)}\r\n"
+                      "Connection: close\r\n\r\n").encode("latin-1") + payload)
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def make_pool(directory, processes=None):
+    """
+    Returns a process pool whose workers share the data already loaded
+    from directory, reloading it from the snapshot where fork is missing.
+
+    Every worker is started before this returns. Workers started later,
+    while a request is being handled, would inherit open client sockets
+    and keep those connections from closing.
+    """
+    processes = processes or os.cpu_count() or 1
+    if "fork" in multiprocessing.get_all_start_methods():
+        pool = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("fork"))
+    else:
+        pool = ProcessPoolExecutor(processes, initializer=degrees.load_data,
+                                   initargs=(directory, False, True))
+    # A worker is only started when a job finds no idle one, so keep
+    # every worker busy at once
+    list(pool.map(time.sleep, [WARM_UP_SECONDS] * processes))
+    return pool
+
+
+async def serve(directory, port):
+    with make_pool(directory) as pool:
+        server = await asyncio.start_server(
+            lambda reader, writer: handle(reader, writer, pool), "127.0.0.1", port)
+        print(f"Serving on http://127.0.0.1:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python server.py [directory] [port]")
+    directory = sys.argv[1] if len(sys.argv) > 1 else "large"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8050
+
+    print("Loading data...")
+    degrees.load_data(directory, snapshot=True)
+    print("Data loaded.")
+    try:
+        asyncio.run(serve(directory, port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import asyncio
+import tempfile
+import unittest
+
+import degrees
+import server
+from degrees_test import write_data
+
+
+class ServerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        write_data(self.directory.name)
+        degrees.graph = None
+        degrees.people, degrees.names, degrees.movies = {}, {}, {}
+        degrees.load_data(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def request(self, target):
+        # None runs searches on the event loop's default thread pool
+        return asyncio.run(server.respond("GET", target, None))
+
+    def test_path(self):
+        status, body = self.request("/path?source=1&target=Dave")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["degrees"], 2)
+        self.assertEqual(body["path"], [("13", "5"), ("14", "4")])
+
+    def test_path_unknown_person(self):
+        status, body = self.request("/path?source=1&target=Nobody")
+        self.assertEqual(status, 404)
+        self.assertIn("error", body)
+
+    def test_path_missing_target(self):
+        status, _ = self.request("/path?source=1")
+        self.assertEqual(status, 400)
+
+    def test_person(self):
+        status, body = self.request("/person?name=alice")
+        self.assertEqual(status, 200)
+        self.assertEqual([person["id"] for person in body["matches"]], ["1", "9"])
+
+    def test_person_suggestions(self):
+        _, body = self.request("/person?name=Dav")
+        self.assertEqual(body["matches"], [])
+        self.assertEqual([person["id"] for person in body["suggestions"]], ["4"])
+
+    def test_handle_with_process_pool(self):
+        async def exchange(port, target):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET " + target + b" HTTP/1.1\r\n\r\n")
+            await writer.drain()
+            # Reading to EOF only finishes once no process holds the socket
+            response = await asyncio.wait_for(reader.read(), 10)
+            writer.close()
+            return response
+
+        async def run():
+            with server.make_pool(self.directory.name, 2) as pool:
+                listener = await asyncio.start_server(
+                    lambda reader, writer: server.handle(reader, writer, pool), "127.0.0.1", 0)
+                port = listener.sockets[0].getsockname()[1]
+                async with listener:
+                    return await asyncio.gather(*(exchange(port, b"/path?source=1&target=Dave")
+                                                  for _ in range(3)),
+                                                exchange(port, b"/person?name=Dav"))
+
+        *paths, person = asyncio.run(run())
+        for response in paths:
+            self.assertTrue(response.startswith(b"HTTP/1.1 200 OK"))
+            self.assertIn(b'"degrees": 2', response)
+        self.assertTrue(person.startswith(b"HTTP/1.1 200 OK"))
+        self.assertIn(b'"suggestions": [{"id": "4"', person)
+
+    def test_unknown_endpoint(self):
+        status, _ = self.request("/movies")
+        self.assertEqual(status, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+"""
+Binary snapshot of a loaded degrees directory.
+
+The snapshot is a single file holding the compact graph arrays and every
+display string, laid out so it can be memory-mapped and used in place:
+
+    MAGIC | header length (uint32) | JSON header | sections...
+
+The header records the size and modification time of each CSV file, and
+the byte offset and length of each section. Sections are either int32
+arrays or string tables (a UTF-8 blob plus an int32 array of offsets).
+"""
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+
+from graph import Graph
+from lookup import NameIndex, name_order
+
+MAGIC = b"DEGREES2"
+FILENAME = "degrees.snapshot"
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+ALIGNMENT = 8
+
+
+def snapshot_path(directory):
+    """
+    Returns where the snapshot for a data directory is kept.
+    """
+    return os.path.join(directory, FILENAME)
+
+
+def source_stamps(directory):
+    """
+    Returns the size and modification time of each CSV file, which
+    together decide whether a snapshot is still up to date.
+    """
+    stamps = {}
+    for filename in SOURCES:
+        stat = os.stat(os.path.join(directory, filename))
+        stamps[filename] = [stat.st_size, stat.st_mtime_ns]
+    return stamps
+
+
+def write_snapshot(directory, graph, people, movies):
+    """
+    Writes the loaded graph and display details for directory to its
+    snapshot file, replacing any previous snapshot.
+    """
+    person_ids = list(graph.person_ids)
+    movie_ids = list(graph.movie_ids)
+    names = [people[person_id]["name"] for person_id in person_ids]
+
+    sections = {
+        "person_offsets": graph.person_offsets,
+        "person_movies": graph.person_movies,
+        "movie_offsets": graph.movie_offsets,
+        "movie_stars": graph.movie_stars,
+        "person_components": graph.components,
+        # Person and movie numbers sorted by id, and people sorted by
+        # lower-cased name, so lookups can bisect instead of hashing
+        "person_order": array("i", sorted(range(len(person_ids)), key=person_ids.__getitem__)),
+        "movie_order": array("i", sorted(range(len(movie_ids)), key=movie_ids.__getitem__)),
+        "name_order": name_order(names),
+    }
+    strings = {
+        "person_ids": person_ids,
+        "person_names": names,
+        "person_births": [people[person_id]["birth"] for person_id in person_ids],
+        "movie_ids": movie_ids,
+        "movie_titles": [movies[movie_id]["title"] for movie_id in movie_ids],
+        "movie_years": [movies[movie_id]["year"] for movie_id in movie_ids],
+    }
+    for name, values in strings.items():
+        blob, offsets = pack_strings(values)
+        sections[f"{name}_blob"] = blob
+        sections[f"{name}_offsets"] = offsets
+
+    layout = {}
+    position = 0
+    for name, data in sections.items():
+        size = memoryview(data).nbytes
+        layout[name] = [position, size]
+        position += padded(size)
+    header = json.dumps({
+        "byteorder": sys.byteorder,
+        "sources": source_stamps(directory),
+        "sections": layout,
+    }).encode("utf-8")
+
+    path = snapshot_path(directory)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(bytes(padded(f.tell()) - f.tell()))
+        for name, data in sections.items():
+            size = memoryview(data).nbytes
+            f.write(data)
+            f.write(bytes(padded(size) - size))
+    os.replace(temporary, path)
+
+
+def read_snapshot(directory):
+    """
+    Maps the snapshot for directory into memory.
+
+    Returns (graph, people, names, movies), where people, names and movies
+    are read-only mappings shaped like the dictionaries in degrees.py.
+    Returns None if there is no snapshot, it is damaged, or the CSV
+    files have changed.
+    """
+    try:
+        with open(snapshot_path(directory), "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    view = memoryview(buffer)
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        return None
+    # A damaged or truncated header makes the snapshot as good as stale
+    try:
+        header_length, = struct.unpack_from("<I", view, len(MAGIC))
+        header_end = len(MAGIC) + 4 + header_length
+        header = json.loads(bytes(view[len(MAGIC) + 4:header_end]))
+        if header["byteorder"] != sys.byteorder or header["sources"] != source_stamps(directory):
+            return None
+        sections = header["sections"]
+        end = padded(header_end) + max((offset + size for offset, size in sections.values()), default=0)
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
+    if end > len(view):
+        return None
+
+    start = padded(header_end)
+
+    def section(name):
+        offset, size = sections[name]
+        return view[start + offset:start + offset + size]
+
+    def ints(name):
+        return section(name).cast("i")
+
+    def strings(name):
+        return StringTable(section(f"{name}_blob"), ints(f"{name}_offsets"))
+
+    person_ids = strings("person_ids")
+    movie_ids = strings("movie_ids")
+    person_index = SortedIndex(person_ids, ints("person_order"))
+    movie_index = SortedIndex(movie_ids, ints("movie_order"))
+    graph = Graph(person_ids, movie_ids,
+                  ints("person_offsets"), ints("person_movies"),
+                  ints("movie_offsets"), ints("movie_stars"),
+                  person_index=person_index, movie_index=movie_index,
+                  components=ints("person_components"))
+
+    person_names = strings("person_names")
+    people = Records(person_index, {"name": person_names, "birth": strings("person_births")})
+    movies = Records(movie_index, {"title": strings("movie_titles"), "year": strings("movie_years")})
+    names = NameIndex(person_ids, person_names, ints("name_order"))
+    return graph, people, names, movies
+
+
+def pack_strings(values):
+    """
+    Packs strings into one UTF-8 blob plus an int32 array of offsets,
+    where string i is blob[offsets[i]:offsets[i + 1]].
+    """
+    offsets = array("i", [0])
+    encoded = []
+    for value in values:
+        data = value.encode("utf-8")
+        encoded.append(data)
+        offsets.append(offsets[-1] + len(data))
+    return b"".join(encoded), offsets
+
+
+def padded(size):
+    """
+    Rounds size up so the next section starts on an aligned offset.
+    """
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+class StringTable():
+    """
+    Sequence of strings decoded on demand from a packed string section.
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class SortedIndex(Mapping):
+    """
+    Maps ids to their numbers by bisecting numbers sorted by id.
+    """
+
+    def __init__(self, ids, order):
+        self.ids = ids
+        self.order = order
+
+    def __getitem__(self, key):
+        i = bisect.bisect_left(self.order, key, key=self.ids.__getitem__)
+        if i < len(self.order) and self.ids[self.order[i]] == key:
+            return self.order[i]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class Records(Mapping):
+    """
+    Maps ids to a dictionary of their display fields, built on demand.
+    """
+
+    def __init__(self, index, fields):
+        self.index = index
+        self.fields = fields
+
+    def __getitem__(self, key):
+        number = self.index[key]
+        return {field: values[number] for field, values in self.fields.items()}
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
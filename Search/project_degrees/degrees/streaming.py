@@ -0,0 +1,121 @@
+"""
+Streaming loader for degrees data.
+
+The CSV files are read a line at a time, and only what searching and
+name lookup need stays in memory: ids, names and the compact graph.
+Births, titles and years are left in the CSV files, and fetched by
+byte offset when a record is looked up.
+"""
+import csv
+from array import array
+from collections import deque
+from collections.abc import Mapping
+
+from graph import Graph
+from lookup import NameIndex, name_order
+
+
+def load_streaming(directory):
+    """
+    Streams the CSV files in directory into a compact graph.
+
+    Returns (graph, people, names, movies), where people, names and movies
+    are read-only mappings shaped like the dictionaries in degrees.py.
+    """
+    person_ids = []
+    person_names = []
+    person_offsets = array("q")
+    for offset, row in read_rows(f"{directory}/people.csv"):
+        person_ids.append(row["id"])
+        person_names.append(row["name"])
+        person_offsets.append(offset)
+    person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+
+    movie_ids = []
+    movie_offsets = array("q")
+    for offset, row in read_rows(f"{directory}/movies.csv"):
+        movie_ids.append(row["id"])
+        movie_offsets.append(offset)
+    movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+    credit_people = array("i")
+    credit_movies = array("i")
+    for _, row in read_rows(f"{directory}/stars.csv"):
+        try:
+            person = person_index[row["person_id"]]
+            movie = movie_index[row["movie_id"]]
+        except KeyError:
+            continue
+        credit_people.append(person)
+        credit_movies.append(movie)
+
+    graph = Graph.from_credits(person_ids, movie_ids, credit_people, credit_movies,
+                               person_index=person_index, movie_index=movie_index)
+    people = CsvRecords(f"{directory}/people.csv", person_index, person_offsets,
+                        {"name": "name", "birth": "birth"})
+    movies = CsvRecords(f"{directory}/movies.csv", movie_index, movie_offsets,
+                        {"title": "title", "year": "year"})
+    names = NameIndex(person_ids, person_names, name_order(person_names))
+    return graph, people, names, movies
+
+
+def read_rows(path):
+    """
+    Yields (offset, row) for every row of a CSV file, where offset is
+    the byte position the row starts at and row maps column names to
+    values. The file is read a line at a time, and blank lines between
+    rows are skipped.
+    """
+    with open(path, "rb") as f:
+        # Start positions of the lines the reader has pulled but not yet
+        # matched to a row; a quoted field can span several lines. Blank
+        # lines are left out, as the reader skips them without a row
+        starts = deque()
+
+        def lines():
+            position = 0
+            for line in f:
+                if line.strip(b"\r\n"):
+                    starts.append(position)
+                position += len(line)
+                yield line.decode("utf-8")
+
+        reader = csv.DictReader(lines())
+        header = True
+        for row in reader:
+            if header:
+                starts.popleft()
+                header = False
+            offset = starts.popleft()
+            starts.clear()
+            yield offset, row
+
+
+class CsvRecords(Mapping):
+    """
+    Maps ids to a dictionary of their display fields, read from the CSV
+    file at path on demand. fields maps each dictionary key to the CSV
+    column it comes from.
+    """
+
+    def __init__(self, path, index, offsets, fields):
+        self.path = path
+        self.index = index
+        self.offsets = offsets
+        self.fields = fields
+        with open(path, encoding="utf-8", newline="") as f:
+            self.header = next(csv.reader(f))
+
+    def __getitem__(self, key):
+        number = self.index[key]
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[number])
+            row = next(csv.reader(line.decode("utf-8") for line in f))
+        values = dict(zip(self.header, row))
+        return {field: values[column] for field, column in self.fields.items()}
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
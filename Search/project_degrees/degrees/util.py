@@ -1,3 +1,9 @@
+import heapq
+import itertools
+import time
+from collections import deque
+
+
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
@@ -6,14 +12,20 @@ class Node():
 
 
 class StackFrontier():
-    def __init__(self):
+    def __init__(self, stats=None):
         self.frontier = []
+        # Counts the nodes held for each state, so membership is a dict lookup
+        self.states = {}
+        self.stats = stats
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+        if self.stats is not None:
+            self.stats.frontier_size(len(self.frontier))
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
@@ -22,17 +34,250 @@ class StackFrontier():
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.frontier.pop()
+            self.forget(node)
             return node
 
+    def forget(self, node):
+        if self.stats is not None:
+            self.stats.nodes_expanded += 1
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+
 
 class QueueFrontier(StackFrontier):
+    def __init__(self, stats=None):
+        super().__init__(stats)
+        self.frontier = deque()
 
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
+            node = self.frontier.popleft()
+            self.forget(node)
+            return node
+
+
+class PriorityFrontier():
+    """
+    Frontier that removes the node with the lowest priority first.
+
+    Nodes live in a binary heap. Adding a state that is already in the
+    frontier with a lower priority replaces its node (decrease-key); the
+    old heap entry is marked dead and skipped when it surfaces. Nodes of
+    equal priority come out lowest tiebreak first, then oldest first.
+    """
+    def __init__(self, stats=None):
+        self.frontier = []
+        # Maps each state to its live [priority, tiebreak, order, node] heap entry
+        self.entries = {}
+        self.order = itertools.count()
+        self.stats = stats
+
+    def add(self, node, priority=0, tiebreak=0):
+        entry = self.entries.get(node.state)
+        if entry is not None:
+            if entry[0] <= priority:
+                return
+            entry[3] = None
+        entry = [priority, tiebreak, next(self.order), node]
+        self.entries[node.state] = entry
+        heapq.heappush(self.frontier, entry)
+        if self.stats is not None:
+            self.stats.frontier_size(len(self.entries))
+
+    def contains_state(self, state):
+        return state in self.entries
+
+    def priority(self, state):
+        return self.entries[state][0]
+
+    def empty(self):
+        return len(self.entries) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        while True:
+            node = heapq.heappop(self.frontier)[3]
+            if node is not None:
+                del self.entries[node.state]
+                if self.stats is not None:
+                    self.stats.nodes_expanded += 1
+                return node
+
+
+def best_first_search(start, is_goal, expand, heuristic=None, stats=None):
+    """
+    A* search from start, returning the Node of the first goal state
+    reached along a cheapest path, or None if no goal can be reached.
+
+    expand(state) yields (action, state, cost) steps out of a state, and
+    heuristic(state) estimates the remaining cost to a goal. The path is
+    cheapest whenever the heuristic never overestimates; with no
+    heuristic this is a uniform-cost search. Work done is counted in
+    stats, if given.
+
+    Among nodes with equal estimated total cost, the one with the larger
+    cost so far is expanded first: on graphs where every step costs the
+    same, many nodes tie, and the deepest of them is the closest to a goal.
+    """
+    if heuristic is None:
+        def heuristic(state):
+            return 0
+    if stats is not None:
+        expand = stats.timed(expand)
+    frontier = PriorityFrontier(stats)
+    frontier.add(Node(state=start, parent=None, action=None), heuristic(start))
+    costs = {start: 0}
+    while not frontier.empty():
+        node = frontier.remove()
+        if is_goal(node.state):
             return node
+        for action, state, step in expand(node.state):
+            cost = costs[node.state] + step
+            if state not in costs or cost < costs[state]:
+                costs[state] = cost
+                frontier.add(Node(state=state, parent=node, action=action),
+                             cost + heuristic(state), -cost)
+    return None
+
+
+def node_path(node):
+    """
+    Returns the (action, state) pairs leading from the root to node.
+    """
+    path = []
+    while node.parent is not None:
+        path.append((node.action, node.state))
+        node = node.parent
+    path.reverse()
+    return path
+
+
+def timed_path(stats, function, *args):
+    """
+    Calls a path reconstruction function, adding the seconds it takes
+    to stats.path_seconds when stats is given.
+    """
+    if stats is None:
+        return function(*args)
+    start = time.perf_counter()
+    path = function(*args)
+    stats.path_seconds += time.perf_counter() - start
+    return path
+
+
+class ExploredSet():
+    """
+    Tracks the states a search has already expanded.
+    """
+    def __init__(self):
+        self.states = set()
+
+    def add(self, state):
+        self.states.add(state)
+
+    def __contains__(self, state):
+        return state in self.states
+
+    def __len__(self):
+        return len(self.states)
+
+
+class SearchTree():
+    """
+    Tree of every state reached by a search from root, mapping each
+    state to its distance from root and the (action, parent) reaching it.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.parents = {root: (0, None, None)}
+
+    def add(self, state, action, parent):
+        self.parents[state] = (self.parents[parent][0] + 1, action, parent)
+
+    def __contains__(self, state):
+        return state in self.parents
+
+    def __len__(self):
+        return len(self.parents)
+
+    def distance(self, state):
+        if state not in self.parents:
+            return None
+        return self.parents[state][0]
+
+    def path_to(self, state):
+        """
+        Returns the (action, state) pairs leading from root to state,
+        or None if state was never reached.
+        """
+        if state not in self.parents:
+            return None
+        path = []
+        while state != self.root:
+            _, action, parent = self.parents[state]
+            path.append((action, state))
+            state = parent
+        path.reverse()
+        return path
+
+
+class SearchStats():
+    """
+    Counts the work one search does: nodes taken off the frontier, the
+    largest the frontier grew, and the seconds spent generating neighbors
+    and reconstructing the path. labels are copied into the record.
+    """
+    def __init__(self, search, **labels):
+        self.search = search
+        self.labels = labels
+        self.nodes_expanded = 0
+        self.frontier_peak = 0
+        self.neighbor_seconds = 0.0
+        self.path_seconds = 0.0
+        self.path_length = None
+        self.started = time.perf_counter()
+
+    def frontier_size(self, size):
+        if size > self.frontier_peak:
+            self.frontier_peak = size
+
+    def timed(self, neighbors):
+        """
+        Wraps a function returning an iterable of neighbors, so the time
+        spent producing them is added to neighbor_seconds.
+        """
+        def timed_neighbors(*args):
+            start = time.perf_counter()
+            iterator = iter(neighbors(*args))
+            while True:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    self.neighbor_seconds += time.perf_counter() - start
+                    return
+                self.neighbor_seconds += time.perf_counter() - start
+                yield item
+                start = time.perf_counter()
+        return timed_neighbors
+
+    def record(self):
+        """
+        Returns the counters as a flat dictionary.
+        """
+        return {
+            "search": self.search,
+            **self.labels,
+            "nodes_expanded": self.nodes_expanded,
+            "frontier_peak": self.frontier_peak,
+            "neighbor_seconds": self.neighbor_seconds,
+            "path_seconds": self.path_seconds,
+            "total_seconds": time.perf_counter() - self.started,
+            "path_length": self.path_length,
+        }
@@ -0,0 +1,111 @@
+import unittest
+
+from util import (ExploredSet, Node, PriorityFrontier, QueueFrontier, SearchStats, StackFrontier,
+                  best_first_search, node_path)
+
+
+class FrontierTest(unittest.TestCase):
+    def test_queue_order(self):
+        frontier = QueueFrontier()
+        for state in ("a", "b", "c"):
+            frontier.add(Node(state=state, parent=None, action=None))
+        self.assertEqual([frontier.remove().state for _ in range(3)], ["a", "b", "c"])
+        self.assertTrue(frontier.empty())
+
+    def test_stack_order(self):
+        frontier = StackFrontier()
+        for state in ("a", "b", "c"):
+            frontier.add(Node(state=state, parent=None, action=None))
+        self.assertEqual([frontier.remove().state for _ in range(3)], ["c", "b", "a"])
+
+    def test_contains_state_with_duplicates(self):
+        frontier = QueueFrontier()
+        frontier.add(Node(state="a", parent=None, action=None))
+        frontier.add(Node(state="a", parent=None, action=None))
+        frontier.remove()
+        self.assertTrue(frontier.contains_state("a"))
+        frontier.remove()
+        self.assertFalse(frontier.contains_state("a"))
+
+    def test_empty_frontier(self):
+        with self.assertRaises(Exception):
+            QueueFrontier().remove()
+
+    def test_priority_order(self):
+        frontier = PriorityFrontier()
+        for state, priority in (("a", 3), ("b", 1), ("c", 2)):
+            frontier.add(Node(state=state, parent=None, action=None), priority)
+        self.assertEqual([frontier.remove().state for _ in range(3)], ["b", "c", "a"])
+        self.assertTrue(frontier.empty())
+
+    def test_priority_decrease_key(self):
+        frontier = PriorityFrontier()
+        frontier.add(Node(state="a", parent=None, action=None), 5)
+        frontier.add(Node(state="b", parent=None, action=None), 3)
+        frontier.add(Node(state="a", parent=None, action="better"), 1)
+        frontier.add(Node(state="a", parent=None, action="worse"), 4)
+        self.assertEqual(frontier.priority("a"), 1)
+        node = frontier.remove()
+        self.assertEqual((node.state, node.action), ("a", "better"))
+        self.assertEqual(frontier.remove().state, "b")
+        self.assertTrue(frontier.empty())
+
+    def test_priority_tiebreak(self):
+        frontier = PriorityFrontier()
+        for state, tiebreak in (("a", 0), ("b", -2), ("c", -1), ("d", -2)):
+            frontier.add(Node(state=state, parent=None, action=None), 1, tiebreak)
+        self.assertEqual([frontier.remove().state for _ in range(4)], ["b", "d", "c", "a"])
+
+    def test_best_first_search_prefers_deeper_ties(self):
+        # A chain s-a-b-g plus side states that all tie with it on f
+        edges = {"s": ["a", "x"], "a": ["b", "y"], "b": ["g", "z"],
+                 "x": [], "y": [], "z": [], "g": []}
+        remaining = {"s": 3, "a": 2, "b": 1, "g": 0, "x": 2, "y": 1, "z": 0}
+        expanded = []
+
+        def expand(state):
+            expanded.append(state)
+            return [(f"{state}-{neighbor}", neighbor, 1) for neighbor in edges[state]]
+
+        goal = best_first_search("s", lambda state: state == "g", expand, remaining.get)
+        self.assertEqual(node_path(goal)[-1], ("b-g", "g"))
+        self.assertEqual(expanded, ["s", "a", "b"])
+
+    def test_best_first_search(self):
+        # Weighted graph where the direct edge is the expensive one
+        edges = {"s": [("s-g", "g", 10), ("s-a", "a", 1)], "a": [("a-g", "g", 2)], "g": []}
+        goal = best_first_search("s", lambda state: state == "g", lambda state: edges[state])
+        self.assertEqual(node_path(goal), [("s-a", "a"), ("a-g", "g")])
+        self.assertIsNone(best_first_search("s", lambda state: state == "x", lambda state: edges[state]))
+
+    def test_frontier_stats(self):
+        stats = SearchStats("test")
+        frontier = QueueFrontier(stats)
+        for state in ("a", "b", "c"):
+            frontier.add(Node(state=state, parent=None, action=None))
+        frontier.remove()
+        frontier.add(Node(state="d", parent=None, action=None))
+        frontier.remove()
+        record = stats.record()
+        self.assertEqual((record["nodes_expanded"], record["frontier_peak"]), (2, 3))
+
+    def test_best_first_search_stats(self):
+        edges = {"s": [("s-a", "a", 1), ("s-b", "b", 1)], "a": [("a-g", "g", 1)], "b": [], "g": []}
+        stats = SearchStats("astar", dataset="tiny")
+        best_first_search("s", lambda state: state == "g", lambda state: edges[state], stats=stats)
+        record = stats.record()
+        self.assertEqual(record["dataset"], "tiny")
+        self.assertEqual(record["frontier_peak"], 2)
+        self.assertGreaterEqual(record["nodes_expanded"], 2)
+        self.assertGreater(record["neighbor_seconds"], 0)
+
+    def test_explored_set(self):
+        explored = ExploredSet()
+        explored.add("a")
+        self.assertIn("a", explored)
+        self.assertNotIn("b", explored)
+        self.assertEqual(len(explored), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Evaluates many tic-tac-toe boards at once with NumPy.
+
+Boards are rows of an (N, 9) integer array, one column per cell in
+reading order, holding EMPTY (0), X (1) or O (2). evaluate answers
+player, terminal, winner and minimax value for every row in one call,
+using the win masks from bitboard.py and a table of minimax values
+for all 3 ** 9 boards, built once at import.
+"""
+import numpy as np
+
+import bitboard
+
+EMPTY = 0
+X = 1
+O = 2
+
+# Boards are numbered in base 3, cell 0 being the lowest digit
+POWERS = 3 ** np.arange(9)
+BITS = 1 << np.arange(9)
+WINNING = np.frombuffer(bitboard.WINNING, dtype=np.uint8).astype(bool)
+
+
+def from_boards(boards):
+    """
+    Returns the (N, 9) array for a list of tictactoe.py boards.
+    """
+    codes = {None: EMPTY, "X": X, "O": O}
+    return np.array([[codes[mark] for row in board for mark in row] for board in boards],
+                    dtype=np.int8).reshape(-1, 9)
+
+
+def rules(boards):
+    """
+    Returns (player, terminal, winner) arrays for an (N, 9) array of boards.
+
+    player is X or O, or EMPTY where one player has made two moves in a
+    row. winner is X, O or EMPTY, X taking precedence if both have a line.
+    """
+    boards = np.asarray(boards)
+    x_marks = boards == X
+    o_marks = boards == O
+    x_wins = WINNING[x_marks @ BITS]
+    o_wins = WINNING[o_marks @ BITS]
+
+    difference = x_marks.sum(axis=1) - o_marks.sum(axis=1)
+    player = np.where(difference == 0, X, np.where(difference == 1, O, EMPTY)).astype(np.int8)
+    winner = np.where(x_wins, X, np.where(o_wins, O, EMPTY)).astype(np.int8)
+    terminal = x_wins | o_wins | ~(boards == EMPTY).any(axis=1)
+    return player, terminal, winner
+
+
+def solve():
+    """
+    Returns the minimax value of every board, indexed by board number:
+    1 if X wins with best play, -1 if O does, 0 for a draw. Boards where
+    one player has made two moves in a row are given 0.
+
+    Boards are solved backwards, fullest first, so each board's children
+    are already known when it is reached.
+    """
+    numbers = np.arange(3 ** 9)
+    boards = (numbers[:, None] // POWERS) % 3
+    player, terminal, winner = rules(boards)
+    marks = (boards != EMPTY).sum(axis=1)
+
+    values = np.zeros(3 ** 9, dtype=np.int8)
+    values[winner == X] = 1
+    values[winner == O] = -1
+    for count in range(8, -1, -1):
+        layer = np.flatnonzero((marks == count) & ~terminal & (player != EMPTY))
+        to_move = player[layer]
+        best = np.where(to_move == X, -2, 2)
+        for cell in range(9):
+            open_cell = boards[layer, cell] == EMPTY
+            child = values[np.where(open_cell, layer + to_move * POWERS[cell], layer)]
+            better = np.where(to_move == X, child > best, child < best)
+            best = np.where(open_cell & better, child, best)
+        values[layer] = best
+    return values
+
+
+VALUES = solve()
+
+
+def evaluate(boards):
+    """
+    Returns (player, terminal, winner, value) arrays for an (N, 9) array
+    of boards, where value is the minimax value of each board.
+    """
+    boards = np.asarray(boards)
+    player, terminal, winner = rules(boards)
+    return player, terminal, winner, VALUES[boards.astype(np.int64) @ POWERS]
@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+import batch
+import bitboard
+import tictactoe
+
+CODES = {None: batch.EMPTY, "X": batch.X, "O": batch.O}
+
+
+def reachable_boards():
+    seen = set()
+    frontier = [(0, 0)]
+    while frontier:
+        x, o = frontier.pop()
+        if (x, o) not in seen:
+            seen.add((x, o))
+            frontier.extend(bitboard.play(x, o, cell) for cell in bitboard.moves(x, o))
+    return [bitboard.to_board(x, o) for x, o in sorted(seen)]
+
+
+class BatchTest(unittest.TestCase):
+    def test_matches_tictactoe(self):
+        boards = reachable_boards()
+        player, terminal, winner, value = batch.evaluate(batch.from_boards(boards))
+        self.assertEqual(len(boards), 5478)
+        for i, board in enumerate(boards):
+            self.assertEqual(player[i], CODES[tictactoe.player(board)])
+            self.assertEqual(terminal[i], tictactoe.terminal(board))
+            self.assertEqual(winner[i], CODES[tictactoe.winner(board)])
+            if tictactoe.player(board) == tictactoe.X:
+                self.assertEqual(value[i], tictactoe.max_value(board)[0])
+            else:
+                self.assertEqual(value[i], tictactoe.min_value(board)[0])
+
+    def test_invalid_board(self):
+        boards = np.array([[1, 1, 0, 0, 0, 0, 0, 0, 0],
+                           [0, 0, 0, 0, 0, 0, 0, 0, 0]])
+        player, terminal, winner, value = batch.evaluate(boards)
+        self.assertEqual(list(player), [batch.EMPTY, batch.X])
+        self.assertEqual(list(terminal), [False, False])
+        self.assertEqual(list(value), [0, 0])
+
+    def test_full_board_without_winner(self):
+        board = batch.from_boards([[["X", "X", "O"],
+                                    ["O", "O", "X"],
+                                    ["X", "O", "X"]]])
+        _, terminal, winner, value = batch.evaluate(board)
+        self.assertTrue(terminal[0])
+        self.assertEqual((winner[0], value[0]), (batch.EMPTY, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
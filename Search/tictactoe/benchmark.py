@@ -0,0 +1,49 @@
+"""
+Compares plain minimax with alpha-beta pruning from the empty board.
+
+Usage: python benchmark.py [runs]
+
+Each run starts with empty tables, so it measures a full solve. The
+opening book, which minimax looks at first, is timed on its own.
+"""
+import sys
+import time
+
+import tictactoe as ttt
+
+
+def measure(search, tables, runs):
+    """
+    Returns (move, nodes visited per run, best seconds per run) for
+    solving the empty board with search, clearing tables before each run.
+    """
+    best = None
+    for _ in range(runs):
+        for table in tables:
+            table.clear()
+        ttt.node_count = 0
+        start = time.perf_counter()
+        move = search(ttt.initial_state())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return move, ttt.node_count, best
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [runs]")
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    searches = [
+        ("minimax", lambda board: ttt.max_value(board)[1], [ttt.transpositions]),
+        ("alphabeta", ttt.alphabeta, [ttt.alphabeta_table]),
+        ("book", ttt.minimax, []),
+    ]
+    print(f"{'search':<10} {'move':<8} {'nodes':>8} {'ms':>9}")
+    for name, search, tables in searches:
+        move, nodes, seconds = measure(search, tables, runs)
+        print(f"{name:<10} {str(move):<8} {nodes:>8} {seconds * 1000:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Bitboard representation of tic-tac-toe positions.
+
+A position is a pair of 9-bit integers (x, o), one for each player's
+marks, where cell (i, j) is bit 3 * i + j. Checking for a win, listing
+moves and making a move are each a few integer operations.
+"""
+
+X = "X"
+O = "O"
+EMPTY = None
+
+FULL = 0b111111111
+
+# Rows, columns and diagonals, as masks of the cells they cover
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+)
+
+# WINNING[marks] is 1 if the cells in marks cover a whole line
+WINNING = bytes(any(marks & mask == mask for mask in WIN_MASKS) for marks in range(FULL + 1))
+
+# MOVES[empty] lists the cells set in empty, lowest first
+MOVES = tuple(tuple(cell for cell in range(9) if empty >> cell & 1) for empty in range(FULL + 1))
+
+
+# The eight symmetries of the board, each as the list of cells that
+# cells 0 to 8 move to: rotations by 0, 90, 180 and 270 degrees, then
+# reflections across the middle column, middle row and both diagonals
+SYMMETRIES = tuple(
+    tuple(3 * i + j for i, j in (image(cell // 3, cell % 3) for cell in range(9)))
+    for image in (
+        lambda i, j: (i, j),
+        lambda i, j: (j, 2 - i),
+        lambda i, j: (2 - i, 2 - j),
+        lambda i, j: (2 - j, i),
+        lambda i, j: (i, 2 - j),
+        lambda i, j: (2 - i, j),
+        lambda i, j: (j, i),
+        lambda i, j: (2 - j, 2 - i),
+    )
+)
+
+# INVERSES[s][cell] is the cell that symmetry s moves onto cell
+INVERSES = tuple(tuple(symmetry.index(cell) for cell in range(9)) for symmetry in SYMMETRIES)
+
+# TRANSFORMS[s][marks] is the mask marks becomes under symmetry s
+TRANSFORMS = tuple(
+    tuple(sum(1 << symmetry[cell] for cell in MOVES[marks]) for marks in range(FULL + 1))
+    for symmetry in SYMMETRIES
+)
+
+
+def from_board(board):
+    """
+    Returns the (x, o) bitboards for a board of nested lists.
+    """
+    x = o = 0
+    for i, row in enumerate(board):
+        for j, mark in enumerate(row):
+            if mark == X:
+                x |= 1 << (3 * i + j)
+            elif mark == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def to_board(x, o):
+    """
+    Returns the board of nested lists for the (x, o) bitboards.
+    """
+    return [[X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1 else EMPTY
+             for j in range(3)]
+            for i in range(3)]
+
+
+def cell(action):
+    """
+    Returns the bit number of the (i, j) action.
+    """
+    return 3 * action[0] + action[1]
+
+
+def action(cell):
+    """
+    Returns the (i, j) action for a bit number, or None for None.
+    """
+    if cell is None:
+        return None
+    return divmod(cell, 3)
+
+
+def player(x, o):
+    """
+    Returns the player whose turn it is, or None if one player has made
+    two moves in a row.
+    """
+    x_moves = bin(x).count("1")
+    o_moves = bin(o).count("1")
+    if x_moves == o_moves:
+        return X
+    if x_moves == o_moves + 1:
+        return O
+    return None
+
+
+def moves(x, o):
+    """
+    Returns the empty cells, or an empty tuple if the game is over.
+    """
+    if WINNING[x] or WINNING[o]:
+        return ()
+    return MOVES[FULL & ~(x | o)]
+
+
+def play(x, o, cell):
+    """
+    Returns the position after the player to move marks cell.
+    """
+    if player(x, o) == O:
+        return x, o | 1 << cell
+    return x | 1 << cell, o
+
+
+def winner(x, o):
+    if WINNING[x]:
+        return X
+    if WINNING[o]:
+        return O
+    return None
+
+
+def terminal(x, o):
+    return bool(WINNING[x] or WINNING[o]) or x | o == FULL
+
+
+def utility(x, o):
+    """
+    Returns 1 if X has won, -1 if O has won, 0 otherwise.
+    """
+    if WINNING[x]:
+        return 1
+    if WINNING[o]:
+        return -1
+    return 0
+
+
+def canonical(x, o):
+    """
+    Returns (x, o, symmetry), where x and o are the smallest of the eight
+    symmetric forms of the position and symmetry is the one that gives it.
+    """
+    best_x, best_o, best = x, o, 0
+    for symmetry in range(1, 8):
+        transform = TRANSFORMS[symmetry]
+        new_x, new_o = transform[x], transform[o]
+        if new_x < best_x or (new_x == best_x and new_o < best_o):
+            best_x, best_o, best = new_x, new_o, symmetry
+    return best_x, best_o, best
+
+
+def restore(cell, symmetry):
+    """
+    Returns the cell in the original orientation for a cell of the
+    position symmetry produced, or None for None.
+    """
+    if cell is None:
+        return None
+    return INVERSES[symmetry][cell]
+
+
+def distinct_moves(x, o):
+    """
+    Returns the empty cells, leaving out any cell whose move gives the same
+    position as an earlier one up to symmetry.
+    """
+    cells = moves(x, o)
+    # The symmetries that leave the position as it is
+    stabilizer = [symmetry for symmetry, transform in zip(SYMMETRIES[1:], TRANSFORMS[1:])
+                  if transform[x] == x and transform[o] == o]
+    if not stabilizer:
+        return cells
+    return tuple(cell for cell in cells
+                 if all(symmetry[cell] >= cell for symmetry in stabilizer))
@@ -0,0 +1,59 @@
+import unittest
+import bitboard
+
+X = "X"
+O = "O"
+EMPTY = None
+
+
+class BitboardTest(unittest.TestCase):
+    def setUp(self):
+        self.board = [[X, O, EMPTY],
+                      [EMPTY, X, EMPTY],
+                      [O, EMPTY, EMPTY]]
+
+    def test_round_trip(self):
+        x, o = bitboard.from_board(self.board)
+        self.assertEqual((x, o), (0b000010001, 0b001000010))
+        self.assertEqual(bitboard.to_board(x, o), self.board)
+
+    def test_moves_and_play(self):
+        x, o = bitboard.from_board(self.board)
+        self.assertEqual(bitboard.player(x, o), X)
+        self.assertEqual(bitboard.moves(x, o), (2, 3, 5, 7, 8))
+        x, o = bitboard.play(x, o, 8)
+        self.assertEqual(bitboard.winner(x, o), X)
+        self.assertEqual(bitboard.utility(x, o), 1)
+        self.assertTrue(bitboard.terminal(x, o))
+        self.assertEqual(bitboard.moves(x, o), ())
+
+    def test_win_masks(self):
+        self.assertFalse(bitboard.WINNING[0b011001100])
+        for mask in bitboard.WIN_MASKS:
+            self.assertEqual(bin(mask).count("1"), 3)
+            self.assertEqual(bitboard.winner(0, mask), O)
+
+    def test_canonical_shared_by_symmetric_positions(self):
+        x, o = bitboard.from_board(self.board)
+        forms = {bitboard.canonical(transform[x], transform[o])[:2]
+                 for transform in bitboard.TRANSFORMS}
+        self.assertEqual(forms, {bitboard.canonical(x, o)[:2]})
+
+    def test_restore_move(self):
+        x, o = bitboard.from_board(self.board)
+        canonical_x, canonical_o, symmetry = bitboard.canonical(x, o)
+        for cell in bitboard.moves(canonical_x, canonical_o):
+            restored = bitboard.play(x, o, bitboard.restore(cell, symmetry))
+            self.assertEqual(bitboard.canonical(*restored)[:2],
+                             bitboard.canonical(*bitboard.play(canonical_x, canonical_o, cell))[:2])
+
+    def test_distinct_moves(self):
+        self.assertEqual(bitboard.distinct_moves(0, 0), (0, 1, 4))
+        x, o = bitboard.from_board([[O, EMPTY, EMPTY],
+                                    [EMPTY, X, EMPTY],
+                                    [EMPTY, EMPTY, EMPTY]])
+        self.assertEqual(bitboard.distinct_moves(x, o), (1, 2, 5, 8))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Writes the opening book: the best move in every tic-tac-toe position.
+
+Usage: python book.py [path]
+
+The game is solved once with tictactoe's minimax search, and the best
+move for every reachable, unfinished position is stored for its
+canonical orientation (see bitboard.canonical). book.bin holds MAGIC
+followed by one little-endian uint32 per position, sorted:
+
+    bits 4-12: x's marks    bits 13-21: o's marks    bits 0-3: best cell
+
+tictactoe.py reads the book at import and answers from it first.
+"""
+import sys
+from array import array
+
+import bitboard
+import tictactoe as ttt
+
+
+def solve():
+    """
+    Returns a dictionary mapping every reachable, unfinished canonical
+    position (x, o) to the best cell for the player to move.
+    """
+    moves = {}
+    frontier = [(0, 0)]
+    while frontier:
+        x, o = frontier.pop()
+        if (x, o) in moves or bitboard.terminal(x, o):
+            continue
+        if bitboard.player(x, o) == ttt.X:
+            moves[x, o] = ttt.position_max(x, o)[1]
+        else:
+            moves[x, o] = ttt.position_min(x, o)[1]
+        for cell in bitboard.distinct_moves(x, o):
+            frontier.append(bitboard.canonical(*bitboard.play(x, o, cell))[:2])
+    return moves
+
+
+def write_book(moves, path=ttt.BOOK_PATH):
+    entries = array("I", sorted((x | o << 9) << 4 | cell for (x, o), cell in moves.items()))
+    if sys.byteorder != "little":
+        entries.byteswap()
+    with open(path, "wb") as f:
+        f.write(ttt.BOOK_MAGIC)
+        f.write(entries.tobytes())
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python book.py [path]")
+    path = sys.argv[1] if len(sys.argv) > 1 else ttt.BOOK_PATH
+    moves = solve()
+    write_book(moves, path)
+    print(f"Wrote {len(moves)} positions to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+m,n,k games: tic-tac-toe on an m by n board, won by k marks in a row.
+
+Usage: python mnk.py [m] [n] [k] [seconds]
+
+Plays the engine against itself, printing each move. Boards are lists of
+rows like in tictactoe.py, and Game offers the same functions for any
+size. Boards from 4x4 up are too big to search to the end, so best_move
+deepens its search until a time budget runs out and scores unfinished
+positions with a heuristic.
+"""
+import random
+import sys
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+EXACT = "exact"
+LOWER = "lower"
+UPPER = "upper"
+
+# Score of a won position, less the number of moves taken to win it
+WIN = 1000000
+
+# Boards with more cells than this only consider moves next to a mark
+OPEN_BOARD = 25
+
+
+class Timeout(Exception):
+    pass
+
+
+class Game():
+    """
+    An m by n board, won by the first player with k marks in a row,
+    column or diagonal.
+    """
+
+    def __init__(self, m=3, n=3, k=3):
+        if k > max(m, n):
+            raise ValueError("k is longer than the board")
+        self.m = m
+        self.n = n
+        self.k = k
+
+        # Every run of k cells that wins, and the runs through each cell
+        self.windows = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < m and 0 <= end_j < n:
+                        self.windows.append(tuple((i + di * step) * n + j + dj * step
+                                                  for step in range(k)))
+        self.cell_windows = [[] for _ in range(m * n)]
+        for w, window in enumerate(self.windows):
+            for cell in window:
+                self.cell_windows[cell].append(w)
+
+        # Cells within one step of each cell
+        self.neighbors = []
+        for cell in range(m * n):
+            i, j = divmod(cell, n)
+            self.neighbors.append([a * n + b
+                                   for a in range(max(0, i - 1), min(m, i + 2))
+                                   for b in range(max(0, j - 1), min(n, j + 2))
+                                   if (a, b) != (i, j)])
+
+        # WEIGHTS[c] is what a window holding c marks of one player only is worth
+        self.weights = [0] + [10 ** c for c in range(k)]
+        self.zobrist = {mark: [random.getrandbits(64) for _ in range(m * n)] for mark in (X, O)}
+        self.table = {}
+        self.nodes = 0
+        self.depth = 0
+        self.deadline = None
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        x_moves = sum(row.count(X) for row in board)
+        o_moves = sum(row.count(O) for row in board)
+        return X if x_moves == o_moves else O
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board,
+        which is empty once the game is over.
+        """
+        if self.terminal(board):
+            return set()
+        return {(i, j) for i in range(self.m) for j in range(self.n) if board[i][j] == EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if not (0 <= i < self.m and 0 <= j < self.n) or board[i][j] != EMPTY \
+                or self.winner(board) is not None:
+            raise ValueError(f"invalid move {action}")
+        new_board = [list(row) for row in board]
+        new_board[i][j] = self.player(board)
+        return new_board
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        cells = [mark for row in board for mark in row]
+        for window in self.windows:
+            mark = cells[window[0]]
+            if mark != EMPTY and all(cells[cell] == mark for cell in window):
+                return mark
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.winner(board) is not None or all(EMPTY not in row for row in board)
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        return {X: 1, O: -1, None: 0}[self.winner(board)]
+
+    def best_move(self, board, seconds=1.0, max_depth=None):
+        """
+        Returns the best action for the current player that iterative
+        deepening finds within seconds, or None if the game is over.
+
+        Each pass searches one move deeper than the last, and the move
+        from the deepest finished pass is returned. The depth reached and
+        positions visited are left in self.depth and self.nodes.
+        """
+        if self.terminal(board):
+            return None
+        position = Position(self, board)
+        self.nodes = 0
+        self.depth = 0
+        self.deadline = time.perf_counter() + seconds
+        # Entries from earlier moves still hold, but keep the table bounded
+        if len(self.table) > 1000000:
+            self.table.clear()
+
+        moves = self.ordered_moves(position, None)
+        best = moves[0]
+        for depth in range(1, (max_depth or position.empty) + 1):
+            try:
+                value, move = self.search_root(position, moves, depth)
+            except Timeout:
+                break
+            best = move
+            self.depth = depth
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(value) >= WIN - position.empty or depth >= position.empty:
+                break
+        return divmod(best, self.n)
+
+    def search_root(self, position, moves, depth):
+        alpha = -WIN - 1
+        best = moves[0]
+        for cell in moves:
+            value = self.move_value(position, cell, depth, alpha, WIN + 1, 0)
+            if value > alpha:
+                alpha = value
+                best = cell
+        return alpha, best
+
+    def move_value(self, position, cell, depth, alpha, beta, ply):
+        """
+        Returns the value of playing cell for the player to move.
+        """
+        if position.play(cell):
+            value = WIN - ply - 1
+        elif position.empty == 0:
+            value = 0
+        else:
+            value = -self.negamax(position, depth - 1, -beta, -alpha, ply + 1)
+        position.undo(cell)
+        return value
+
+    def negamax(self, position, depth, alpha, beta, ply):
+        """
+        Returns the value of the position for the player to move, searching
+        depth more moves ahead with alpha-beta pruning.
+        """
+        self.nodes += 1
+        if self.nodes & 63 == 0 and time.perf_counter() > self.deadline:
+            raise Timeout
+        if depth == 0:
+            return position.score if position.mover == X else -position.score
+
+        entry = self.table.get(position.key)
+        first = None
+        if entry is not None:
+            entry_depth, value, bound, first = entry
+            if entry_depth >= depth and (bound == EXACT
+                                         or (bound == LOWER and value >= beta)
+                                         or (bound == UPPER and value <= alpha)):
+                return value
+
+        original_alpha = alpha
+        best_value = -WIN - 1
+        best = None
+        for cell in self.ordered_moves(position, first):
+            value = self.move_value(position, cell, depth, alpha, beta, ply)
+            if value > best_value:
+                best_value = value
+                best = cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            bound = UPPER
+        elif best_value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table[position.key] = (depth, best_value, bound, best)
+        return best_value
+
+    def ordered_moves(self, position, first):
+        """
+        Returns the cells worth trying, most promising first: first (the
+        best move stored for the position), then the cells that extend the
+        mover's lines or block the opponent's the most.
+        """
+        cells = position.candidates()
+        counts = position.counts[position.mover]
+        opponent = position.counts[O if position.mover == X else X]
+        weights = self.weights
+
+        def gain(cell):
+            total = 0
+            for w in self.cell_windows[cell]:
+                if opponent[w] == 0:
+                    total += weights[counts[w] + 1]
+                if counts[w] == 0:
+                    total += weights[opponent[w] + 1]
+            return total
+
+        cells.sort(key=gain, reverse=True)
+        if first in cells:
+            cells.remove(first)
+            cells.insert(0, first)
+        return cells
+
+
+class Position():
+    """
+    Board state used while searching, updated in place as moves are made
+    and undone. score is the heuristic value for X: every window holding
+    marks of only one player adds (for X) or subtracts (for O) its weight.
+    """
+
+    def __init__(self, game, board):
+        self.game = game
+        self.cells = [mark for row in board for mark in row]
+        self.counts = {X: [0] * len(game.windows), O: [0] * len(game.windows)}
+        self.score = 0
+        self.key = 0
+        self.empty = 0
+        self.mover = X
+        marks = {X: 0, O: 0}
+        for cell, mark in enumerate(self.cells):
+            if mark == EMPTY:
+                self.empty += 1
+                continue
+            marks[mark] += 1
+            self.key ^= game.zobrist[mark][cell]
+            for w in game.cell_windows[cell]:
+                self.counts[mark][w] += 1
+        for w in range(len(game.windows)):
+            self.score += self.window_score(w)
+        self.mover = X if marks[X] == marks[O] else O
+
+    def window_score(self, w):
+        x, o = self.counts[X][w], self.counts[O][w]
+        if x and not o:
+            return self.game.weights[x]
+        if o and not x:
+            return -self.game.weights[o]
+        return 0
+
+    def play(self, cell):
+        """
+        Marks cell for the player to move, returning True if that wins.
+        Only the windows through cell are looked at.
+        """
+        mark = self.mover
+        counts = self.counts[mark]
+        won = False
+        for w in self.game.cell_windows[cell]:
+            self.score -= self.window_score(w)
+            counts[w] += 1
+            self.score += self.window_score(w)
+            if counts[w] == self.game.k:
+                won = True
+        self.cells[cell] = mark
+        self.key ^= self.game.zobrist[mark][cell]
+        self.empty -= 1
+        self.mover = O if mark == X else X
+        return won
+
+    def undo(self, cell):
+        """
+        Takes back the mark on cell, which must be the last move played.
+        """
+        mark = self.cells[cell]
+        counts = self.counts[mark]
+        for w in self.game.cell_windows[cell]:
+            self.score -= self.window_score(w)
+            counts[w] -= 1
+            self.score += self.window_score(w)
+        self.cells[cell] = EMPTY
+        self.key ^= self.game.zobrist[mark][cell]
+        self.empty += 1
+        self.mover = mark
+
+    def candidates(self):
+        """
+        Returns the empty cells to consider. On large boards these are the
+        cells next to a mark, or the center when the board is empty.
+        """
+        game = self.game
+        if len(self.cells) <= OPEN_BOARD:
+            return [cell for cell, mark in enumerate(self.cells) if mark == EMPTY]
+        if self.empty == len(self.cells):
+            return [(game.m // 2) * game.n + game.n // 2]
+        cells = set()
+        for cell, mark in enumerate(self.cells):
+            if mark != EMPTY:
+                cells.update(neighbor for neighbor in game.neighbors[cell]
+                             if self.cells[neighbor] == EMPTY)
+        return list(cells) or [cell for cell, mark in enumerate(self.cells) if mark == EMPTY]
+
+
+def main():
+    if len(sys.argv) > 5:
+        sys.exit("Usage: python mnk.py [m] [n] [k] [seconds]")
+    m = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else m
+    k = int(sys.argv[3]) if len(sys.argv) > 3 else min(m, n, 5)
+    seconds = float(sys.argv[4]) if len(sys.argv) > 4 else 1.0
+
+    game = Game(m, n, k)
+    board = game.initial_state()
+    while not game.terminal(board):
+        start = time.perf_counter()
+        move = game.best_move(board, seconds)
+        elapsed = time.perf_counter() - start
+        print(f"{game.player(board)} plays {move} "
+              f"(depth {game.depth}, {game.nodes} nodes, {elapsed:.2f}s)")
+        board = game.result(board, move)
+    for row in board:
+        print(" ".join(mark or "." for mark in row))
+    print(f"Winner: {game.winner(board) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import time
+import unittest
+import mnk
+
+X = "X"
+O = "O"
+EMPTY = None
+
+
+class MnkTest(unittest.TestCase):
+    def test_tictactoe_rules(self):
+        game = mnk.Game()
+        board = game.initial_state()
+        self.assertEqual(len(game.actions(board)), 9)
+        board = game.result(board, (1, 1))
+        self.assertEqual(game.player(board), O)
+        with self.assertRaises(ValueError):
+            game.result(board, (1, 1))
+
+    def test_winner_on_larger_board(self):
+        game = mnk.Game(5, 5, 4)
+        board = game.initial_state()
+        for step in range(4):
+            board[step + 1][3 - step] = X
+        self.assertEqual(game.winner(board), X)
+        self.assertTrue(game.terminal(board))
+        self.assertEqual(game.utility(board), 1)
+        self.assertEqual(game.actions(board), set())
+
+    def test_takes_winning_move(self):
+        game = mnk.Game()
+        board = [[EMPTY, X, X],
+                 [O, O, X],
+                 [O, X, EMPTY]]
+        self.assertEqual(game.best_move(board), (0, 0))
+
+    def test_blocks_four_in_a_row(self):
+        game = mnk.Game(7, 7, 4)
+        board = game.initial_state()
+        for j in (1, 2, 3):
+            board[3][j] = X
+        board[0][0] = O
+        board[6][6] = O
+        self.assertIn(game.best_move(board, seconds=0.5), {(3, 0), (3, 4)})
+
+    def test_position_play_and_undo(self):
+        game = mnk.Game(4, 4, 3)
+        board = game.initial_state()
+        board[0][0] = X
+        board[1][1] = O
+        position = mnk.Position(game, board)
+        score, key = position.score, position.key
+        self.assertFalse(position.play(6))
+        played = mnk.Position(game, game.result(board, (1, 2)))
+        self.assertEqual(position.score, played.score)
+        self.assertEqual(position.key, played.key)
+        position.undo(6)
+        self.assertEqual((position.score, position.key, position.mover), (score, key, X))
+
+    def test_perfect_play_draws(self):
+        game = mnk.Game()
+        board = game.initial_state()
+        while not game.terminal(board):
+            board = game.result(board, game.best_move(board))
+        self.assertIsNone(game.winner(board))
+
+    def test_time_budget(self):
+        game = mnk.Game(15, 15, 5)
+        board = game.initial_state()
+        board[7][7] = X
+        board[7][8] = O
+        start = time.perf_counter()
+        move = game.best_move(board, seconds=0.2)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIn(move, game.actions(board))
+        self.assertGreaterEqual(game.depth, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
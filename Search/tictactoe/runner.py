@@ -1,5 +1,6 @@
 import pygame
 import sys
+import threading
 import time
 
 import tictactoe as ttt
@@ -17,15 +18,35 @@ mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
+# Posted by the AI thread when it has chosen a move
+AI_MOVE = pygame.USEREVENT + 1
+
+
+def think(board, game):
+    """
+    Finds the AI's move off the main loop and posts it back as an
+    AI_MOVE event, tagged with the game it was asked for.
+    """
+    time.sleep(0.5)
+    move = ttt.minimax(board)
+    pygame.event.post(pygame.event.Event(AI_MOVE, move=move, game=game))
+
+
+clock = pygame.time.Clock()
 user = None
 board = ttt.initial_state()
-ai_turn = False
+ai_thinking = False
+# Counts games played, so a move for an abandoned game can be ignored
+game = 0
 
 while True:
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             sys.exit()
+        if event.type == AI_MOVE and event.game == game:
+            board = ttt.result(board, event.move)
+            ai_thinking = False
 
     screen.fill(black)
 
@@ -108,15 +129,10 @@ while True:
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
-        if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+        # Start the AI thinking, without waiting for it
+        if user != player and not game_over and not ai_thinking:
+            ai_thinking = True
+            threading.Thread(target=think, args=(board, game), daemon=True).start()
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
@@ -141,6 +157,8 @@ while True:
                     time.sleep(0.2)
                     user = None
                     board = ttt.initial_state()
-                    ai_turn = False
+                    ai_thinking = False
+                    game += 1
 
     pygame.display.flip()
+    clock.tick(60)
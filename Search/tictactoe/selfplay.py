@@ -0,0 +1,152 @@
+"""
+Plays tic-tac-toe games between engines, without pygame.
+
+Usage: python selfplay.py [games] [processes] [output]
+
+Every matchup in MATCHUPS plays the given number of games, spread over a
+pool of worker processes. A JSON summary of outcomes, move latency and
+nodes searched per engine is printed; with output, every game is also
+written there as one JSON line.
+
+Engines:
+    minimax     tictactoe.minimax, answering from the opening book
+    search      minimax search without the book, tables cleared each game
+    alphabeta   alpha-beta search, tables cleared each game
+    random      a uniformly random legal move
+"""
+import json
+import random
+import statistics
+import sys
+import time
+from multiprocessing import Pool
+
+import tictactoe as ttt
+
+MATCHUPS = [
+    ("minimax", "minimax"),
+    ("alphabeta", "search"),
+    ("minimax", "random"),
+    ("random", "minimax"),
+    ("search", "random"),
+    ("random", "alphabeta"),
+    ("alphabeta", "random"),
+]
+
+
+def search(board):
+    if ttt.player(board) == ttt.X:
+        return ttt.max_value(board)[1]
+    return ttt.min_value(board)[1]
+
+
+ENGINES = {
+    "minimax": ttt.minimax,
+    "search": search,
+    "alphabeta": ttt.alphabeta,
+}
+
+
+def play_game(game):
+    """
+    Plays one game, given as (x engine, o engine, seed), and returns its
+    record: the engines, the winner and every move with its latency and
+    the number of positions searched for it.
+    """
+    x_engine, o_engine, seed = game
+    chooser = random.Random(seed)
+    ttt.transpositions.clear()
+    ttt.alphabeta_table.clear()
+
+    board = ttt.initial_state()
+    moves = []
+    while not ttt.terminal(board):
+        player = ttt.player(board)
+        engine = x_engine if player == ttt.X else o_engine
+        ttt.node_count = 0
+        start = time.perf_counter()
+        if engine == "random":
+            move = chooser.choice(sorted(ttt.actions(board)))
+        else:
+            move = ENGINES[engine](board)
+        elapsed = time.perf_counter() - start
+        moves.append({"player": player, "engine": engine, "move": list(move),
+                      "ms": elapsed * 1000, "nodes": ttt.node_count})
+        board = ttt.result(board, move)
+
+    return {"x": x_engine, "o": o_engine, "seed": seed,
+            "winner": ttt.winner(board), "moves": moves}
+
+
+def play_games(count, processes=None, seed=0):
+    """
+    Plays count games of every matchup across processes worker processes,
+    returning the game records in matchup order.
+    """
+    games = [(x_engine, o_engine, seed + i)
+             for x_engine, o_engine in MATCHUPS for i in range(count)]
+    with Pool(processes) as pool:
+        return pool.map(play_game, games, chunksize=max(1, count // 4))
+
+
+def summarize(records):
+    """
+    Returns outcome counts per matchup and latency and node statistics
+    per engine. A game lost by a searching engine to anything is counted
+    in ai_losses, which should always be 0.
+    """
+    matchups = {}
+    engines = {}
+    ai_losses = 0
+    for record in records:
+        outcome = matchups.setdefault(f"{record['x']} vs {record['o']}",
+                                      {"games": 0, "x_wins": 0, "o_wins": 0, "draws": 0})
+        outcome["games"] += 1
+        if record["winner"] == ttt.X:
+            outcome["x_wins"] += 1
+            ai_losses += record["o"] != "random"
+        elif record["winner"] == ttt.O:
+            outcome["o_wins"] += 1
+            ai_losses += record["x"] != "random"
+        else:
+            outcome["draws"] += 1
+        for move in record["moves"]:
+            engine = engines.setdefault(move["engine"], {"ms": [], "nodes": []})
+            engine["ms"].append(move["ms"])
+            engine["nodes"].append(move["nodes"])
+
+    latency = {}
+    for name, engine in engines.items():
+        ms = sorted(engine["ms"])
+        latency[name] = {
+            "moves": len(ms),
+            "mean_ms": statistics.mean(ms),
+            "p50_ms": ms[len(ms) // 2],
+            "p99_ms": ms[min(len(ms) - 1, int(0.99 * len(ms)))],
+            "max_ms": ms[-1],
+            "mean_nodes": statistics.mean(engine["nodes"]),
+            "max_nodes": max(engine["nodes"]),
+        }
+    return {"matchups": matchups, "engines": latency, "ai_losses": ai_losses}
+
+
+def main():
+    if len(sys.argv) > 4:
+        sys.exit("Usage: python selfplay.py [games] [processes] [output]")
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    start = time.perf_counter()
+    records = play_games(count, processes)
+    summary = summarize(records)
+    summary["seconds"] = time.perf_counter() - start
+
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import unittest
+import selfplay
+
+
+class SelfPlayTest(unittest.TestCase):
+    def test_play_game(self):
+        record = selfplay.play_game(("minimax", "random", 1))
+        self.assertEqual((record["x"], record["o"]), ("minimax", "random"))
+        self.assertNotEqual(record["winner"], "O")
+        self.assertEqual([move["player"] for move in record["moves"][:2]], ["X", "O"])
+        for move in record["moves"]:
+            self.assertGreaterEqual(move["ms"], 0)
+
+    def test_search_counts_nodes(self):
+        record = selfplay.play_game(("search", "alphabeta", 0))
+        self.assertIsNone(record["winner"])
+        self.assertGreater(record["moves"][0]["nodes"], 0)
+
+    def test_play_games_in_pool(self):
+        records = selfplay.play_games(2, processes=2)
+        self.assertEqual(len(records), 2 * len(selfplay.MATCHUPS))
+        summary = selfplay.summarize(records)
+        self.assertEqual(summary["ai_losses"], 0)
+        self.assertEqual(summary["matchups"]["minimax vs minimax"]["draws"], 2)
+        self.assertEqual(set(summary["engines"]), {"minimax", "search", "alphabeta", "random"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,41 @@
 """
 Tic Tac Toe Player
 """
-import copy
-import math
+import os
+import sys
+from array import array
+
+import bitboard
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Maps (x, o, "max" or "min") to the (value, cell) found by
+# max_value or min_value, kept for as long as the process runs. Positions
+# are stored in their canonical orientation (see bitboard.canonical), so
+# rotated and reflected copies of a position share one entry.
+transpositions = {}
+
+# Maps canonical (x, o, "max" or "min") to the (value, bound, cell) found by
+# the alpha-beta search, where bound says whether value is exact or only
+# a lower or upper bound. The move is tried first on the next visit.
+alphabeta_table = {}
+EXACT = "exact"
+LOWER = "lower"
+UPPER = "upper"
+
+# Cells in the order alpha-beta tries them: center, corners, then edges
+MOVE_ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]
+
+# Number of positions visited by the searches, for benchmarking
+node_count = 0
+
+# The opening book written by book.py, holding the best move for every
+# position of the game
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+BOOK_MAGIC = b"TTTBOOK1"
+
 
 def initial_state():
     """
@@ -22,146 +50,255 @@ def player(board):
     """
     Returns player who has the next turn on a board.
     """
-    x_moves_made = 0
-    o_moves_made = 0
-    for row in range(3):
-        for cell in range(3):
-            if board[row][cell] == X:
-                x_moves_made += 1
-            if board[row][cell] == O:
-                o_moves_made += 1
-
-    if x_moves_made == o_moves_made + 1:
-        return O
-    if x_moves_made == o_moves_made:
-        return X
-    else:
+    current_player = bitboard.player(*bitboard.from_board(board))
+    if current_player is None:
         return "Someone has made 2 moves in a row! "
+    return current_player
 
 
 def actions(board):
     """
     Returns set of all possible actions (i, j) available on the board.
     """
-    possible_moves = set()
-    for row in range(3):
-        for cell in range(3):
-            if board[row][cell] == EMPTY:
-                possible_moves.add((row, cell))
-    if len(possible_moves) == 0:
-        return None
-    elif winner(board):
+    cells = bitboard.moves(*bitboard.from_board(board))
+    if not cells:
         return None
-    else:
-        return possible_moves
+    return {bitboard.action(cell) for cell in cells}
 
 
 def result(board, action):
     """
     Returns the board that results from making move (i, j) on the board.
     """
-    new_board = copy.deepcopy(board)
-    if action not in actions(board):
+    i, j = action
+    if i not in range(3) or j not in range(3):
+        raise Exception("Move invalid ")
+    x, o = bitboard.from_board(board)
+    if bitboard.cell(action) not in bitboard.moves(x, o):
         raise Exception("Move invalid ")
-    new_board[action[0]][action[1]] = player(board)
-    return new_board
+    return bitboard.to_board(*bitboard.play(x, o, bitboard.cell(action)))
 
 
 def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-    victor = None
-    for coordinate in range(3):
-        if board[coordinate][0] == board[coordinate][1] == board[coordinate][2]:
-            victor = board[coordinate][0]
-        if board[0][coordinate] == board[1][coordinate] == board[2][coordinate]:
-            victor = board[0][coordinate]
-    if board[0][0] == board[1][1] == board[2][2]:
-        victor = board[0][0]
-    if board[0][2] == board[1][1] == board[2][0]:
-        victor = board[0][2]
-    return victor
+    return bitboard.winner(*bitboard.from_board(board))
 
 
 def terminal(board):
     """
     Returns True if game is over, False otherwise.
     """
-    empty_cells = 0
-    for row in range(3):
-        for cell in range(3):
-            if board[row][cell] == EMPTY:
-                empty_cells += 1
-    if empty_cells == 0:
-        return True
-    if winner(board):
-        return True
-    if empty_cells > 0:
-        return False
+    return bitboard.terminal(*bitboard.from_board(board))
 
 
 def utility(board):
     """
     Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
     """
-    board_value = 0
-    if winner(board) == X:
-        board_value = 1
-    if winner(board) == O:
-        board_value = -1
-    return board_value
+    return bitboard.utility(*bitboard.from_board(board))
 
 
 def max_value(board):
-    optimal_move = None
-    v = float("-inf")
-    if terminal(board):
-        info = (utility(board), None)
-        return info
-    else:
-        for move in actions(board):
-            new_value = min_value(result(board, move))[0]
-            if new_value is None:
-                print(f"{new_value}")
-                break
-            if v < new_value:
-                v = new_value
-                optimal_move = move
-        info = (v, optimal_move)
-        return info
+    value, cell = position_max(*bitboard.from_board(board))
+    return value, bitboard.action(cell)
 
 
 def min_value(board):
-    optimal_move = None
-    v = float("inf")
-    if terminal(board):
-        info = (utility(board), None)
-        assert isinstance(info, tuple)
-        return info
-    else:
-        for move in actions(board):
-            new_value = max_value(result(board, move))[0]
-            if new_value is None:
-                break
-            if v > new_value:
-                v = new_value
-                optimal_move = move
-        info = (v, optimal_move)
-        assert isinstance(info, tuple)
-        return info
+    value, cell = position_min(*bitboard.from_board(board))
+    return value, bitboard.action(cell)
+
+
+def position_max(x, o):
+    global node_count
+    node_count += 1
+    x, o, symmetry = bitboard.canonical(x, o)
+    key = (x, o, "max")
+    if key not in transpositions:
+        optimal_move = None
+        v = float("-inf")
+        if bitboard.terminal(x, o):
+            v = bitboard.utility(x, o)
+        else:
+            for cell in bitboard.distinct_moves(x, o):
+                new_value = position_min(*bitboard.play(x, o, cell))[0]
+                if v < new_value:
+                    v = new_value
+                    optimal_move = cell
+        transpositions[key] = (v, optimal_move)
+    value, cell = transpositions[key]
+    return value, bitboard.restore(cell, symmetry)
+
+
+def position_min(x, o):
+    global node_count
+    node_count += 1
+    x, o, symmetry = bitboard.canonical(x, o)
+    key = (x, o, "min")
+    if key not in transpositions:
+        optimal_move = None
+        v = float("inf")
+        if bitboard.terminal(x, o):
+            v = bitboard.utility(x, o)
+        else:
+            for cell in bitboard.distinct_moves(x, o):
+                new_value = position_max(*bitboard.play(x, o, cell))[0]
+                if v > new_value:
+                    v = new_value
+                    optimal_move = cell
+        transpositions[key] = (v, optimal_move)
+    value, cell = transpositions[key]
+    return value, bitboard.restore(cell, symmetry)
 
 
 def minimax(board):
     """
-    Returns the optimal action for the current player on the board.
+    Returns the optimal action for the current player on the board,
+    from the opening book when it has the position.
     """
     if terminal(board):
         return None
 
+    x, o, symmetry = bitboard.canonical(*bitboard.from_board(board))
+    if (x, o) in opening_book:
+        return bitboard.action(bitboard.restore(opening_book[x, o], symmetry))
+
     current_player = player(board)
     if current_player == X:
         optimal_move = max_value(board)[1]
     else:
         optimal_move = min_value(board)[1]
     return optimal_move
+
+
+def ordered_moves(x, o, first=None):
+    """
+    Returns the empty cells that give distinct positions, in MOVE_ORDER,
+    with first (a move remembered from an earlier search) moved to the
+    front.
+    """
+    cells = sorted(bitboard.distinct_moves(x, o), key=MOVE_ORDER.index)
+    if first in cells:
+        cells.remove(first)
+        cells.insert(0, first)
+    return cells
+
+
+def alphabeta_lookup(key, alpha, beta):
+    """
+    Returns (value, move, first) for a position in alphabeta_table. value
+    is None unless the stored entry settles the position for this window;
+    first is the stored move to try first otherwise.
+    """
+    entry = alphabeta_table.get(key)
+    if entry is None:
+        return None, None, None
+    value, bound, move = entry
+    if bound == EXACT or (bound == LOWER and value >= beta) or (bound == UPPER and value <= alpha):
+        return value, move, move
+    return None, None, move
+
+
+def alphabeta_store(key, value, move, alpha, beta):
+    if value <= alpha:
+        bound = UPPER
+    elif value >= beta:
+        bound = LOWER
+    else:
+        bound = EXACT
+    alphabeta_table[key] = (value, bound, move)
+
+
+def alphabeta_max(x, o, alpha, beta):
+    global node_count
+    node_count += 1
+    if bitboard.terminal(x, o):
+        return bitboard.utility(x, o), None
+    x, o, symmetry = bitboard.canonical(x, o)
+    key = (x, o, "max")
+    value, move, first = alphabeta_lookup(key, alpha, beta)
+    if value is not None:
+        return value, bitboard.restore(move, symmetry)
+
+    optimal_move = None
+    v = float("-inf")
+    original_alpha = alpha
+    for cell in ordered_moves(x, o, first):
+        new_value = alphabeta_min(*bitboard.play(x, o, cell), alpha, beta)[0]
+        if v < new_value:
+            v = new_value
+            optimal_move = cell
+        alpha = max(alpha, v)
+        if alpha >= beta:
+            break
+    alphabeta_store(key, v, optimal_move, original_alpha, beta)
+    return v, bitboard.restore(optimal_move, symmetry)
+
+
+def alphabeta_min(x, o, alpha, beta):
+    global node_count
+    node_count += 1
+    if bitboard.terminal(x, o):
+        return bitboard.utility(x, o), None
+    x, o, symmetry = bitboard.canonical(x, o)
+    key = (x, o, "min")
+    value, move, first = alphabeta_lookup(key, alpha, beta)
+    if value is not None:
+        return value, bitboard.restore(move, symmetry)
+
+    optimal_move = None
+    v = float("inf")
+    original_beta = beta
+    for cell in ordered_moves(x, o, first):
+        new_value = alphabeta_max(*bitboard.play(x, o, cell), alpha, beta)[0]
+        if v > new_value:
+            v = new_value
+            optimal_move = cell
+        beta = min(beta, v)
+        if alpha >= beta:
+            break
+    alphabeta_store(key, v, optimal_move, alpha, original_beta)
+    return v, bitboard.restore(optimal_move, symmetry)
+
+
+def alphabeta(board):
+    """
+    Returns the optimal action for the current player on the board,
+    using alpha-beta pruning with ordered moves.
+    """
+    if terminal(board):
+        return None
+
+    x, o = bitboard.from_board(board)
+    if player(board) == X:
+        return bitboard.action(alphabeta_max(x, o, float("-inf"), float("inf"))[1])
+    return bitboard.action(alphabeta_min(x, o, float("-inf"), float("inf"))[1])
+
+
+def read_book(path):
+    """
+    Returns the opening book at path as a dictionary mapping canonical
+    positions (x, o) to their best cell, or an empty dictionary if there
+    is no book or it is damaged. See book.py for the file format.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return {}
+    if not data.startswith(BOOK_MAGIC):
+        return {}
+    try:
+        entries = array("I", data[len(BOOK_MAGIC):])
+    except ValueError:
+        # Not a whole number of entries, so the file was cut short
+        return {}
+    if sys.byteorder != "little":
+        entries.byteswap()
+    if any(entry & 0xf > 8 for entry in entries):
+        return {}
+    return {(entry >> 4 & 0x1ff, entry >> 13): entry & 0xf for entry in entries}
+
+
+opening_book = read_book(BOOK_PATH)
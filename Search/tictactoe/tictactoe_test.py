@@ -1,4 +1,7 @@
+import os
+import tempfile
 import unittest
+import book
 import tictactoe
 
 X = "X"
@@ -6,6 +9,12 @@ O = "O"
 EMPTY = None
 
 
+def minimax_value(board):
+    if tictactoe.player(board) == X:
+        return tictactoe.max_value(board)[0]
+    return tictactoe.min_value(board)[0]
+
+
 class TicTacToeTest(unittest.TestCase):
     def setUp(self):
         self.empty_board = [[EMPTY, EMPTY, EMPTY],
@@ -105,6 +114,105 @@ class TicTacToeTest(unittest.TestCase):
         value = tictactoe.max_value(self.two_possible_actions)[0]
         self.assertEqual(value, 1)
         print(f"{tictactoe.max_value(self.two_possible_actions)}")
+
+    def test_minimax_winning_move(self):
+        self.assertEqual(tictactoe.minimax(self.two_possible_actions), (0, 0))
+
+    def test_transpositions_reused(self):
+        tictactoe.transpositions.clear()
+        tictactoe.min_value(self.o_turn)
+        stored = len(tictactoe.transpositions)
+        self.assertGreater(stored, 0)
+        tictactoe.min_value(self.o_turn)
+        self.assertEqual(len(tictactoe.transpositions), stored)
+
+    def test_winner_with_empty_line(self):
+        board = [[X, X, X],
+                 [EMPTY, EMPTY, EMPTY],
+                 [O, O, EMPTY]]
+        self.assertEqual(tictactoe.winner(board), X)
+        self.assertTrue(tictactoe.terminal(board))
+
+    def test_result_leaves_board_unchanged(self):
+        board = tictactoe.result(self.o_turn, self.action)
+        self.assertEqual(board, [[EMPTY, X, EMPTY],
+                                 [EMPTY, O, EMPTY],
+                                 [EMPTY, EMPTY, EMPTY]])
+        self.assertEqual(self.o_turn[1][1], EMPTY)
+        with self.assertRaises(Exception):
+            tictactoe.result(self.o_turn, (0, 1))
+
+    def test_result_off_the_board(self):
+        for action in ((0, 3), (1, -1), (3, 0), (-1, 1)):
+            with self.assertRaises(Exception):
+                tictactoe.result(self.empty_board, action)
+
+    def test_transpositions_hold_unique_positions(self):
+        tictactoe.transpositions.clear()
+        tictactoe.max_value(self.empty_board)
+        self.assertEqual(len(tictactoe.transpositions), 765)
+
+    def test_minimax_move_in_original_orientation(self):
+        rotated = [[O, O, EMPTY],
+                   [X, O, X],
+                   [EMPTY, X, X]]
+        self.assertEqual(tictactoe.minimax(rotated), (0, 2))
+        self.assertEqual(tictactoe.alphabeta(rotated), (0, 2))
+
+    def test_opening_book(self):
+        self.assertEqual(len(tictactoe.opening_book), 627)
+        self.assertEqual(book.solve(), tictactoe.opening_book)
+        for board in (self.empty_board, self.o_turn, self.two_possible_actions):
+            move = tictactoe.minimax(board)
+            self.assertEqual(minimax_value(tictactoe.result(board, move)), minimax_value(board))
+
+    def test_minimax_without_book(self):
+        saved = dict(tictactoe.opening_book)
+        tictactoe.opening_book.clear()
+        try:
+            self.assertEqual(tictactoe.minimax(self.two_possible_actions), (0, 0))
+        finally:
+            tictactoe.opening_book.update(saved)
+
+    def test_damaged_book(self):
+        with open(tictactoe.BOOK_PATH, "rb") as f:
+            data = f.read()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.bin")
+            # Cut short in the middle of an entry
+            with open(path, "wb") as f:
+                f.write(data[:-1])
+            self.assertEqual(tictactoe.read_book(path), {})
+            # A best cell that is not on the board
+            with open(path, "wb") as f:
+                f.write(data[:-4] + bytes([0xf]) + data[-3:])
+            self.assertEqual(tictactoe.read_book(path), {})
+            with open(path, "wb") as f:
+                f.write(data)
+            self.assertEqual(tictactoe.read_book(path), tictactoe.opening_book)
+
+    def test_alphabeta_winning_move(self):
+        self.assertEqual(tictactoe.alphabeta(self.two_possible_actions), (0, 0))
+
+    def test_alphabeta_matches_minimax(self):
+        boards = [self.empty_board, self.o_turn]
+        for board in list(boards):
+            boards.extend(tictactoe.result(board, action) for action in tictactoe.actions(board))
+        for board in boards:
+            expected = minimax_value(board)
+            move = tictactoe.alphabeta(board)
+            self.assertEqual(minimax_value(tictactoe.result(board, move)), expected)
+
+    def test_alphabeta_visits_fewer_nodes(self):
+        tictactoe.transpositions.clear()
+        tictactoe.node_count = 0
+        tictactoe.max_value(self.empty_board)
+        minimax_nodes = tictactoe.node_count
+
+        tictactoe.alphabeta_table.clear()
+        tictactoe.node_count = 0
+        tictactoe.alphabeta(self.empty_board)
+        self.assertLess(tictactoe.node_count, minimax_nodes)
 """
     def test_minimum_value_move(self):
         move = tictactoe.min_value(self.two_possible_actions)[1]